@@ -1,70 +1,195 @@
 from fastapi import HTTPException, Depends, Request
-from auth import verify_token
-from scoring import calculate_bridge_score, calculate_vulnerability, Vul, calculate_imp, calculate_vp
+from fastapi.responses import JSONResponse
+from auth import verify_token, create_session_token, hash_password, check_password
+from scoring import (calculate_bridge_score, calculate_vulnerability, calculate_vulnerability_code, Vul,
+                     calculate_imp, calculate_vp)
 from movements import round_robin, swiss_pairing
-from database import calculate_match_result, get_master_conn, get_tournament_conn, init_tournament_db
-import secrets
+from database import (calculate_match_result, acquire_master_conn, release_master_conn,
+                      acquire_tournament_conn, release_tournament_conn, init_tournament_db,
+                      acquire_master_reader, release_master_reader,
+                      acquire_tournament_reader, release_tournament_reader,
+                      parse_boards, SQL_SELECT_ROUND_BOARDS, SQL_INSERT_ROUND, SQL_SELECT_MATCH_RESULT,
+                      SQL_UPSERT_BOARD_RESULT, SQL_SELECT_COMPLETED_BOARDS, SQL_SELECT_TABLE_RESULTS,
+                      SQL_UPDATE_BOARD_RESULT,
+                      record_opponents, rebuild_team_history)
+import asyncio
 import sqlite3
-from datetime import datetime, timedelta
+import json
+import logging
 import math
 import random
+import time
+from functools import lru_cache
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
 DEBUG_MODE = False
 
+logger = logging.getLogger("bridge")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed."""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+async def read_json(request: Request):
+    """Parse the request body, with orjson when it is installed."""
+    body = await request.body()
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+async def db_call(fn, *args):
+    """Run blocking SQLite work in a worker thread so the event loop stays free."""
+    return await asyncio.to_thread(fn, *args)
+
+
+# Seconds a looked-up "current tournament" row is reused before re-querying
+CURRENT_TOURNAMENT_TTL = 1.0
+_current_tournament = {"row": None, "ts": float("-inf")}
+
+# Seconds a table's "has a password" answer is reused; set_table_password updates
+# its own entry, so this only bounds staleness across worker processes
+HAS_PASSWORD_TTL = 30.0
+_has_password = {}  # (tournament_id, table_id) -> (has_password, monotonic time)
+
+# Vulnerability display text and short value, keyed by Vul
+VUL_INFO = {
+    Vul.NONE: ("None Vulnerable", "None"),
+    Vul.NS: ("NS Vulnerable", "NS"),
+    Vul.EW: ("EW Vulnerable", "EW"),
+    Vul.ALL: ("Both Vulnerable", "Both")
+}
+
+# Declarer seats that are vulnerable, indexed by Vul value (Vul.ALL covers any declarer)
+VULNERABLE_SEATS = (frozenset(), frozenset('NS'), frozenset('EW'))
+VUL_ALL = Vul.ALL.value
+# Declarers whose scores are stored negated (scores are kept from NS's side)
+EW_SEATS = frozenset('EW')
+
+
+# Response keys for list endpoints, in the column order of their SELECTs
+RESULT_KEYS = ("boardNumber", "contract", "declarer", "result", "score")
+MATCHUP_KEYS = ("id", "tableId", "entry1Id", "entry2Id", "boards", "status")
+ROUND_KEYS = ("id", "tournamentId", "roundNumber", "tableId", "entry1Id", "entry2Id", "boards", "status")
+SCORE_KEYS = ("id", "tableId", "boardNumber", "contract", "declarer", "result", "score")
+
+
+def is_declarer_vulnerable(board_number: int, declarer: str) -> bool:
+    """Whether the declaring side is vulnerable on the given board."""
+    vul = calculate_vulnerability_code(board_number)
+    return vul == VUL_ALL or declarer in VULNERABLE_SEATS[vul]
+
+
+def get_current_tournament_row():
+    """Return the most recently created tournament row, or None if there is none.
+
+    The lookup is cached for CURRENT_TOURNAMENT_TTL seconds so read endpoints
+    don't open the master DB on every request.
+    """
+    now = time.monotonic()
+    if now - _current_tournament["ts"] < CURRENT_TOURNAMENT_TTL:
+        return _current_tournament["row"]
+    
+    conn = acquire_master_reader()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT * FROM tournaments ORDER BY created_at DESC LIMIT 1")
+        row = cursor.fetchone()
+    finally:
+        release_master_reader(conn)
+    
+    _current_tournament["row"] = row
+    _current_tournament["ts"] = now
+    return row
+
+
+def get_current_tournament_id():
+    """Return the id of the most recently created tournament, or None."""
+    row = get_current_tournament_row()
+    return row[0] if row else None
+
+
+def cache_current_tournament(row) -> None:
+    """Make row the cached current tournament, e.g. right after creating it."""
+    _current_tournament["row"] = row
+    _current_tournament["ts"] = time.monotonic()
+
+
 # Movement type handlers
 def handle_swiss(cursor, tournament_id: int, num_entries: int, new_round: int) -> list:
     """Generate matchups for Swiss movement."""
-    # Get current standings
-    cursor.execute("""SELECT table_id, SUM(vp) as total_vp
-                      FROM match_results
-                      GROUP BY table_id
-                      ORDER BY total_vp DESC""")
-    standings_results = cursor.fetchall()
+    # Standings and opponent history for every known team in one pass
+    cursor.execute("""WITH ids AS (SELECT team_id AS id FROM team_history
+                                   UNION SELECT table_id FROM standings)
+                      SELECT ids.id, standings.total_vp, team_history.opponents
+                      FROM ids
+                      LEFT JOIN standings ON standings.table_id = ids.id
+                      LEFT JOIN team_history ON team_history.team_id = ids.id
+                      ORDER BY standings.total_vp DESC""")
     
     team_ids = list(range(1, num_entries + 1))
+    standings = {}
+    previous_opponents = {tid: set() for tid in team_ids}
+    for team_id, total_vp, opponents in cursor.fetchall():
+        if total_vp is not None:
+            standings[team_id] = float(total_vp)
+        if opponents is not None and team_id in previous_opponents:
+            previous_opponents[team_id] = set(json.loads(opponents))
     
-    # Build standings dictionary
-    if standings_results:
-        standings = {row[0]: float(row[1]) for row in standings_results}
-    else:
+    if not standings:
         standings = {tid: 0.0 for tid in team_ids}
     
-    # Build previous opponents dictionary
-    cursor.execute("""SELECT entry1_id, entry2_id 
-                      FROM rounds 
-                      WHERE round_number < ?""",
-                   (new_round,))
-    previous_matches = cursor.fetchall()
-    
-    previous_opponents = {tid: [] for tid in team_ids}
-    for entry1, entry2 in previous_matches:
-        if entry1 in previous_opponents:
-            previous_opponents[entry1].append(entry2)
-        if entry2 in previous_opponents:
-            previous_opponents[entry2].append(entry1)
-    
     # Get pairings from swiss_pairing algorithm
-    pairings = swiss_pairing(team_ids, standings, previous_opponents, new_round)
-    
-    # Convert from swiss_pairing format to simple matchup format
-    # swiss_pairing returns: List[Tuple[int, str, int, int]] = (table_id, room, team_ns, team_ew)
-    # We need: List[Tuple[int, int]] = (team1, team2)
-    round_matchups = []
-    seen_tables = set()
-    for table_id, room, team_ns, team_ew in pairings:
-        if table_id not in seen_tables:
-            round_matchups.append((team_ns, team_ew))
-            seen_tables.add(table_id)
+    # Only the open room is needed: it gives one (team_ns, team_ew) entry per match
+    pairings = swiss_pairing(team_ids, standings, previous_opponents, new_round, room_filter='open')
+    round_matchups = [(team_ns, team_ew) for table_id, room, team_ns, team_ew in pairings]
     
+    record_opponents(cursor, round_matchups)
     return round_matchups
 
 
+@lru_cache(maxsize=64)
+def round_robin_rounds(num_entries: int) -> tuple:
+    """Round-robin schedule with bye matches removed, cached per field size."""
+    bye_team = num_entries + 1 if num_entries % 2 == 1 else None
+    return tuple(
+        tuple((team1, team2) for team1, team2 in round_pairings
+              if team1 != bye_team and team2 != bye_team)
+        for round_pairings in round_robin(num_entries)
+    )
+
+
+def round_boards(round_number: int, boards_per_round: int) -> str:
+    """The rounds.boards range string ("start-end") played in a given round."""
+    return f"{(round_number - 1) * boards_per_round + 1}-{round_number * boards_per_round}"
+
+
+def matchup_rows(matchups, round_number: int, boards: str):
+    """rounds rows placing each (entry1, entry2) matchup at its own table."""
+    for table_id, (entry1, entry2) in enumerate(matchups, start=1):
+        yield (round_number, table_id, entry1, entry2, boards)
+
+
+def duplicate_matchup_rows(matchups, round_number: int, boards: str):
+    """rounds rows for teams matches: two tables per matchup with the teams' seats swapped."""
+    for index, (entry1, entry2) in enumerate(matchups):
+        # Table 1: entry1 NS, entry2 EW
+        yield (round_number, 2 * index + 1, entry1, entry2, boards)
+        # Table 2: entry1 EW, entry2 NS (duplicate)
+        yield (round_number, 2 * index + 2, entry2, entry1, boards)
+
+
 def handle_rotation(num_entries: int, new_round: int) -> list:
     """Generate matchups using simple rotation/fallback movement."""
-    team_ids = list(range(1, num_entries + 1))
-    offset = (new_round - 1) % (len(team_ids) - 1)
-    round_matchups = [(team_ids[i], team_ids[(i + offset) % len(team_ids)]) 
-                     for i in range(0, len(team_ids), 2) if i + offset < len(team_ids)]
-    return round_matchups
+    # Entries are numbered 1..num_entries, so pairings are plain integer arithmetic
+    offset = (new_round - 1) % (num_entries - 1)
+    return [(i + 1, i + offset + 1) for i in range(0, num_entries - offset, 2)]
 
 
 def register_api_routes(app):
@@ -73,26 +198,29 @@ def register_api_routes(app):
     @app.post("/api/scores")
     async def get_scores(request: Request, auth: dict = Depends(verify_token)):
         """Submit board scores - requires authentication."""
-        data = await request.json()
+        data = await read_json(request)
         name = data.get('name')
         score = data.get('score')
         
         tournament_id = auth['tournament_id']
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+        def save_name_score():
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("INSERT INTO scores (name, score) VALUES (?, ?)", (name, score))
-            conn.commit()
-        finally:
-            conn.close()
+            try:
+                cursor.execute("INSERT INTO scores (name, score) VALUES (?, ?)", (name, score))
+                conn.commit()
+            finally:
+                release_tournament_conn(tournament_id, conn)
+
+            logger.info("Name: %s, Score: %s (Table %s)", name, score, auth['table_id'])
+            return {"status": "success", "name": name, "score": score}
 
-        print(f"Name: {name}, Score: {score} (Table {auth['table_id']})")
-        return {"status": "success", "name": name, "score": score}
+        return await db_call(save_name_score)
 
     @app.post("/api/tournament/setup")
     async def setup_tournament(request: Request):
-        data = await request.json()
+        data = await read_json(request)
         
         tournament_name = data.get('tournamentName')
         tournament_form = data.get('tournamentForm', 'pairs')
@@ -106,217 +234,171 @@ def register_api_routes(app):
         if not tournament_name or not tournament_form or not num_entries:
             raise HTTPException(status_code=422, detail="Missing required fields")
 
-        master_conn = get_master_conn()
-        master_cursor = master_conn.cursor()
+        def create_tournament():
+            master_conn = acquire_master_conn()
+            master_cursor = master_conn.cursor()
         
-        try:
-            # Insert tournament
-            master_cursor.execute("""INSERT INTO tournaments 
+            try:
+                # Insert tournament
+                master_cursor.execute("""INSERT INTO tournaments 
+                                (tournament_name, tournament_form, num_entries, 
+                                boards_per_round, scoring_method, movement_type, director_password) 
+                                VALUES (?, ?, ?, ?, ?, ?, ?)
+                                RETURNING *""",
                             (tournament_name, tournament_form, num_entries, 
-                            boards_per_round, scoring_method, movement_type, director_password) 
-                            VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                        (tournament_name, tournament_form, num_entries, 
-                            boards_per_round, scoring_method, movement_type, director_password))
-            tournament_id = master_cursor.lastrowid
-            master_conn.commit()
-        finally:
-            master_conn.close()
-        
-        # Initialize tournament specific database
-        init_tournament_db(tournament_id)
-        
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
-        
-        try:
-            # Calculate number of tables and rounds
-            num_rounds = 0
-            num_tables = 0
+                                boards_per_round, scoring_method, movement_type, director_password))
+                tournament_row = master_cursor.fetchone()
+                tournament_id = tournament_row[0]
+                master_conn.commit()
+            finally:
+                release_master_conn(master_conn)
+            # The new tournament is the current one; no need to re-query for it
+            cache_current_tournament(tournament_row)
+        
+            # Initialize tournament specific database
+            init_tournament_db(tournament_id)
+        
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
+        
+            try:
+                # Calculate number of tables and rounds
+                num_rounds = 0
+                num_tables = 0
+                # Collected (round_number, table_id, entry1_id, entry2_id, boards) rows
+                rows = []
             
-            if tournament_form == 'pairs':
-                num_tables = (num_entries + 1) // 2
+                if tournament_form == 'pairs':
+                    num_tables = (num_entries + 1) // 2
                 
-                if movement_type == 'mitchell':
-                    num_rounds = num_entries // 2
-                elif movement_type == 'howell':
-                    num_rounds = num_entries - 1
-                else:
-                    num_rounds = 1
+                    if movement_type == 'mitchell':
+                        num_rounds = num_entries // 2
+                    elif movement_type == 'howell':
+                        num_rounds = num_entries - 1
+                    else:
+                        num_rounds = 1
                     
-                # Create rounds table entries for pairs
-                for round_num in range(1, num_rounds + 1):
-                    for table in range(1, num_tables + 1):
-                        if table * 2 <= num_entries:
-                            entry1 = table * 2 - 1
-                            entry2 = table * 2
-                            start_board = (round_num - 1) * boards_per_round + 1
-                            end_board = round_num * boards_per_round
-                            boards = f"{start_board}-{end_board}"
-                            
-                            cursor.execute("""INSERT INTO rounds 
-                                        (round_number, table_id, entry1_id, entry2_id, boards) 
-                                        VALUES (?, ?, ?, ?, ?)""",
-                                    (round_num, table, entry1, entry2, boards))
-            
-            elif tournament_form == 'teams':
-                num_tables = (num_entries // 2) * 2  # Each match needs 2 tables
-                if movement_type == 'round-robin':
-                    # For round-robin: each match needs 2 tables (duplicate bridge)
-                    all_rounds = round_robin(num_entries)
-                    num_rounds = len(all_rounds)
-
-                    # Create rounds table entries for teams round-robin (duplicate)
-                    for round_num in range(1, num_rounds + 1):
-                        round_pairings = all_rounds[round_num - 1]
-                        if num_entries % 2 == 1:
-                            bye_team = num_entries + 1
-                            round_pairings = [
-                                (team1, team2)
-                                for team1, team2 in round_pairings
-                                if team1 != bye_team and team2 != bye_team
-                            ]
-
-                        table_id_counter = 1
-                        for entry1, entry2 in round_pairings:
-                            # Table 1: entry1 NS, entry2 EW
-                            start_board = (round_num - 1) * boards_per_round + 1
-                            end_board = round_num * boards_per_round
-                            boards = f"{start_board}-{end_board}"
-
-                            cursor.execute("""INSERT INTO rounds 
-                                        (round_number, table_id, entry1_id, entry2_id, boards) 
-                                        VALUES (?, ?, ?, ?, ?)""",
-                                    (round_num, table_id_counter, entry1, entry2, boards))
-
-                            # Table 2: entry1 EW, entry2 NS (duplicate)
-                            table_id_counter += 1
-                            cursor.execute("""INSERT INTO rounds 
-                                        (round_number, table_id, entry1_id, entry2_id, boards) 
-                                        VALUES (?, ?, ?, ?, ?)""",
-                                    (round_num, table_id_counter, entry2, entry1, boards))
-                            table_id_counter += 1
+                    # Create rounds table entries for pairs
+                    boards_list = [round_boards(r, boards_per_round) for r in range(1, num_rounds + 1)]
+                    rows = [(round_num, table, table * 2 - 1, table * 2, boards)
+                            for round_num, boards in enumerate(boards_list, start=1)
+                            for table in range(1, num_entries // 2 + 1)]
+            
+                elif tournament_form == 'teams':
+                    num_tables = (num_entries // 2) * 2  # Each match needs 2 tables
+                    if movement_type == 'round-robin':
+                        # For round-robin: each match needs 2 tables (duplicate bridge)
+                        all_rounds = round_robin_rounds(num_entries)
+                        num_rounds = len(all_rounds)
+
+                        # Create rounds table entries for teams round-robin (duplicate)
+                        boards_list = [round_boards(r, boards_per_round) for r in range(1, num_rounds + 1)]
+                        for round_num, round_pairings in enumerate(all_rounds, start=1):
+                            rows.extend(duplicate_matchup_rows(round_pairings, round_num, boards_list[round_num - 1]))
                 
-                elif movement_type == 'swiss':
-                    # Swiss: calculate expected rounds but don't pre-populate (dynamic pairings)
-                    if not user_num_rounds or user_num_rounds < 1:
-                        raise HTTPException(status_code=422,
-                                            detail="Number of rounds must be specified for Swiss movement")
-                    num_rounds = user_num_rounds
-                    teams = list(range(1, num_entries + 1))
-                    random.shuffle(teams)
-                    for tables in range(1, num_tables + 1):
-                        cursor.execute("""INSERT INTO rounds 
-                                    (round_number, table_id, entry1_id, entry2_id, boards) 
-                                    VALUES (?, ?, ?, ?, ?)""",
-                                (1, tables, teams[tables // 2], teams[tables // 2 + 1], f"1-{boards_per_round}"))
-                    # Don't create rounds - they will be generated by advance_round based on standings
-
-                elif movement_type == 'knockout':
-                    # Knockout: calculate expected rounds but don't pre-populate (dynamic pairings)
-                    num_rounds = math.ceil(math.log2(num_entries))
-                    for tables in range(1, (num_entries // 2) * 2 + 1):
-                        cursor.execute("""INSERT INTO rounds 
-                                    (round_number, table_id, entry1_id, entry2_id, boards) 
-                                    VALUES (?, ?, ?, ?, ?)""",
-                                (1, tables, None, None, f"1-{boards_per_round}"))
-                    # Don't create rounds - they will be generated based on match results
+                    elif movement_type == 'swiss':
+                        # Swiss: calculate expected rounds but don't pre-populate (dynamic pairings)
+                        if not user_num_rounds or user_num_rounds < 1:
+                            raise HTTPException(status_code=422,
+                                                detail="Number of rounds must be specified for Swiss movement")
+                        num_rounds = user_num_rounds
+                        teams = list(range(1, num_entries + 1))
+                        random.shuffle(teams)
+                        for tables in range(1, num_tables + 1):
+                            rows.append((1, tables, teams[tables // 2], teams[tables // 2 + 1], round_boards(1, boards_per_round)))
+                        # Don't create rounds - they will be generated by advance_round based on standings
+
+                    elif movement_type == 'knockout':
+                        # Knockout: calculate expected rounds but don't pre-populate (dynamic pairings)
+                        num_rounds = math.ceil(math.log2(num_entries))
+                        for tables in range(1, (num_entries // 2) * 2 + 1):
+                            rows.append((1, tables, None, None, round_boards(1, boards_per_round)))
+                        # Don't create rounds - they will be generated based on match results
                 
-            else:
-                # Unknown movement type for teams
-                num_rounds = 1
-                num_tables = (num_entries // 2) * 2
+                else:
+                    # Unknown movement type for teams
+                    num_rounds = 1
+                    num_tables = (num_entries // 2) * 2
 
-            conn.commit()
-        finally:
-            conn.close()
+                # One prepared statement for every row, committed as a single transaction
+                cursor.executemany(SQL_INSERT_ROUND, rows)
+                if movement_type == 'swiss':
+                    record_opponents(cursor, [(row[2], row[3]) for row in rows])
+                conn.commit()
+                # The bulk insert is when row counts change enough to matter to the planner;
+                # PRAGMA optimize would skip tables this connection hasn't queried yet
+                cursor.execute("ANALYZE")
+            finally:
+                release_tournament_conn(tournament_id, conn)
 
-        print(f"Tournament setup: {tournament_name} - {num_tables} tables, {num_rounds} rounds created")
-        return {
-            "status": "success", 
-            "message": "Tournament configuration saved and rounds created", 
-            "tournament_id": tournament_id,
-            "rounds_created": num_rounds
-        }
+            logger.info("Tournament setup: %s - %s tables, %s rounds created", tournament_name, num_tables, num_rounds)
+            return {
+                "status": "success", 
+                "message": "Tournament configuration saved and rounds created", 
+                "tournament_id": tournament_id,
+                "rounds_created": num_rounds
+            }
+
+        return await db_call(create_tournament)
 
     @app.get("/api/tournament/current")
     async def get_current_tournament(request: Request):
-        conn = get_master_conn()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("SELECT * FROM tournaments ORDER BY created_at DESC LIMIT 1")
-            result = cursor.fetchone()
-        finally:
-            conn.close()
+        def read_current_tournament():
+            result = get_current_tournament_row()
         
-        if result:
-            tournament_id = result[0]
-            
-            # Get round count from tournament DB
-            t_conn = get_tournament_conn(tournament_id)
-            t_cursor = t_conn.cursor()
-            try:
-                t_cursor.execute("SELECT COUNT(DISTINCT round_number) FROM rounds")
-                num_rounds_result = t_cursor.fetchone()
-                num_rounds = num_rounds_result[0] if num_rounds_result else 0
-            except sqlite3.OperationalError:
-                # Table might not exist if initialization failed
-                num_rounds = 0
-            finally:
-                t_conn.close()
+            if result:
+                tournament_id = result[0]
+            
+                # Get round count from tournament DB
+                t_conn = acquire_tournament_reader(tournament_id)
+                t_cursor = t_conn.cursor()
+                try:
+                    t_cursor.execute("SELECT COUNT(DISTINCT round_number) FROM rounds")
+                    num_rounds_result = t_cursor.fetchone()
+                    num_rounds = num_rounds_result[0] if num_rounds_result else 0
+                except sqlite3.OperationalError:
+                    # Table might not exist if initialization failed
+                    num_rounds = 0
+                finally:
+                    release_tournament_reader(tournament_id, t_conn)
             
-            return {
-                "id": tournament_id,
-                "tournamentName": result[1],
-                "tournamentForm": result[2],
-                "numEntries": result[3],
-                "boardsPerRound": result[4],
-                "scoringMethod": result[5],
-                "movementType": result[6],
-                "numRounds": num_rounds,
-                "createdAt": result[7]
-            }
-        return {"status": "none", "message": "No tournament configured"}
+                return {
+                    "id": tournament_id,
+                    "tournamentName": result[1],
+                    "tournamentForm": result[2],
+                    "numEntries": result[3],
+                    "boardsPerRound": result[4],
+                    "scoringMethod": result[5],
+                    "movementType": result[6],
+                    "numRounds": num_rounds,
+                    "createdAt": result[7]
+                }
+            return {"status": "none", "message": "No tournament configured"}
+
+        return await db_call(read_current_tournament)
 
     @app.get("/api/tournament/{tournament_id}/rounds")
     async def get_tournament_rounds(tournament_id: int, request: Request):
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("SELECT * FROM rounds ORDER BY round_number, table_id")
-            results = cursor.fetchall()
-        finally:
-            conn.close()
-        
-        rounds = []
-        for row in results:
-            rounds.append({
-                "id": row[0],
-                "tournamentId": row[1],
-                "roundNumber": row[2],
-                "tableId": row[3],
-                "entry1Id": row[4],
-                "entry2Id": row[5],
-                "boards": row[6],
-                "status": row[7]
-            })
-        
-        return {"rounds": rounds}
+        def read_rounds():
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
+        
+            try:
+                cursor.execute("""SELECT id, ?, round_number, table_id, entry1_id, entry2_id, boards, status
+                                  FROM rounds ORDER BY round_number, table_id""",
+                               (tournament_id,))
+                results = cursor.fetchall()
+            finally:
+                release_tournament_reader(tournament_id, conn)
+        
+            return {"rounds": [dict(zip(ROUND_KEYS, row)) for row in results]}
+
+        return await db_call(read_rounds)
 
     @app.get("/api/board/{board_number}/vulnerability")
     async def get_board_vulnerability(board_number: int):
         """Get vulnerability for a specific board number."""
-        vul_enum = calculate_vulnerability(board_number)
-        
-        vul_map = {
-            Vul.NONE: ("None Vulnerable", "None"),
-            Vul.NS: ("NS Vulnerable", "NS"),
-            Vul.EW: ("EW Vulnerable", "EW"),
-            Vul.ALL: ("Both Vulnerable", "Both")
-        }
-        
-        vul_text, vul_value = vul_map[vul_enum]
+        vul_text, vul_value = VUL_INFO[calculate_vulnerability(board_number)]
         
         return {
             "vulnerability": vul_value,
@@ -326,58 +408,41 @@ def register_api_routes(app):
 
     @app.get("/api/table/{table_id}/round/{round_number}/boards")
     async def get_table_boards(table_id: int, round_number: int, request: Request):
-        # Get current tournament ID from master DB
-        m_conn = get_master_conn()
-        m_cursor = m_conn.cursor()
-        tournament_id = None
-        try:
-            m_cursor.execute("SELECT id FROM tournaments ORDER BY created_at DESC LIMIT 1")
-            tournament = m_cursor.fetchone()
-            if tournament:
-                tournament_id = tournament[0]
-        finally:
-            m_conn.close()
-            
-        if not tournament_id:
-            return {"boards": []}
+        def read_boards():
+            tournament_id = get_current_tournament_id()
+            if not tournament_id:
+                return {"boards": []}
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("SELECT boards FROM rounds WHERE table_id = ? AND round_number = ?",
-                        (table_id, round_number))
-            round_data = cursor.fetchone()
-            
-            if not round_data:
-                return {"boards": []}
+            try:
+                cursor.execute(SQL_SELECT_ROUND_BOARDS,
+                            (table_id, round_number))
+                round_data = cursor.fetchone()
             
-            boards_str = round_data[0]
-            if '-' in boards_str:
-                start, end = map(int, boards_str.split('-'))
-                board_numbers = list(range(start, end + 1))
-            else:
-                board_numbers = [int(boards_str)]
+                if not round_data:
+                    return {"boards": []}
             
-            boards = []
-            for board_num in board_numbers:
-                cursor.execute("SELECT id FROM board_results WHERE table_id = ? AND round_number = ? AND board_number = ?",
-                            (table_id, round_number, board_num))
-                completed = cursor.fetchone() is not None
-                
-                boards.append({
-                    "boardNumber": board_num,
-                    "completed": completed
-                })
+                board_numbers = parse_boards(round_data[0])
             
-            return {"boards": boards}
-        finally:
-            conn.close()
+                # Fetch every completed board for this table/round in one query
+                cursor.execute(SQL_SELECT_COMPLETED_BOARDS, (table_id, round_number))
+                completed = {row[0] for row in cursor.fetchall()}
+
+                boards = [{"boardNumber": board_num, "completed": board_num in completed}
+                          for board_num in board_numbers]
+
+                return {"boards": boards}
+            finally:
+                release_tournament_reader(tournament_id, conn)
+
+        return await db_call(read_boards)
 
     @app.post("/api/score/submit")
     async def submit_score(request: Request, auth: dict = Depends(verify_token)):
         """Submit board scores - requires authentication."""
-        data = await request.json()
+        data = await read_json(request)
         
         table_id = data.get('tableId')
         round_number = data.get('round')
@@ -395,311 +460,302 @@ def register_api_routes(app):
         # Use tournament_id from auth token
         tournament_id = auth['tournament_id']
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+        def save_score():
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            vul_enum = calculate_vulnerability(board_number)
+            try:
+                vulnerable = is_declarer_vulnerable(board_number, declarer)
             
-            vul_map = {
-                Vul.NONE: "None",
-                Vul.NS: "NS",
-                Vul.EW: "EW",
-                Vul.ALL: "Both"
-            }
-            vulnerability = vul_map[vul_enum]
+                try:
+                    score = calculate_bridge_score(contract, vulnerable, int(result))
+                    if declarer in EW_SEATS:
+                        score = -score
+                except Exception as e:
+                    raise HTTPException(status_code=400, detail=f"Error calculating score: {str(e)}")
+            
+                cursor.execute(SQL_UPSERT_BOARD_RESULT,
+                            (table_id, round_number, board_number, contract, declarer, vulnerable, result, score))
+            
+                conn.commit()
+            
+                logger.info("Score submitted: Table %s, Board %s, Contract %s, Score %s",
+                            table_id, board_number, contract, score)
+                return {"status": "success", "score": score, "message": "Score saved successfully"}
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+            finally:
+                release_tournament_conn(tournament_id, conn)
+
+        return await db_call(save_score)
+
+    @app.post("/api/score/submit_batch")
+    async def submit_score_batch(request: Request, auth: dict = Depends(verify_token)):
+        """Submit several board scores in one request - requires authentication."""
+        data = await read_json(request)
+        scores = data.get('scores')
+        
+        if not isinstance(scores, list) or not scores:
+            raise HTTPException(status_code=422, detail="scores must be a non-empty list")
+        
+        tournament_id = auth['tournament_id']
+        
+        rows = []
+        results = []
+        for entry in scores:
+            table_id = entry.get('tableId')
+            round_number = entry.get('round')
+            board_number = entry.get('boardNumber')
+            contract = entry.get('contract')
+            declarer = entry.get('declarer')
+            result = entry.get('result')
             
-            vulnerable = False
-            if vulnerability == 'Both':
-                vulnerable = True
-            elif vulnerability == 'NS' and (declarer == 'N' or declarer == 'S'):
-                vulnerable = True
-            elif vulnerability == 'EW' and (declarer == 'E' or declarer == 'W'):
-                vulnerable = True
+            if table_id != auth['table_id']:
+                raise HTTPException(status_code=403, detail="Not authorized to submit scores for this table")
             
+            if not all([table_id, round_number, board_number, contract, declarer, result is not None]):
+                raise HTTPException(status_code=422, detail="Missing required fields")
+            
+            vulnerable = is_declarer_vulnerable(board_number, declarer)
             try:
                 score = calculate_bridge_score(contract, vulnerable, int(result))
-                if declarer in ['E', 'W']:
+                if declarer in EW_SEATS:
                     score = -score
             except Exception as e:
-                raise HTTPException(status_code=400, detail=f"Error calculating score: {str(e)}")
-            
-            cursor.execute("SELECT id FROM board_results WHERE table_id = ? AND round_number = ? AND board_number = ?",
-                        (table_id, round_number, board_number))
-            existing = cursor.fetchone()
-            
-            if existing:
-                cursor.execute("""UPDATE board_results 
-                                SET contract = ?, declarer = ?, vulnerable = ?, result = ?, score = ?
-                                WHERE id = ?""",
-                            (contract, declarer, vulnerable, result, score, existing[0]))
-            else:
-                cursor.execute("""INSERT INTO board_results 
-                                (table_id, round_number, board_number, contract, declarer, vulnerable, result, score)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                            (table_id, round_number, board_number, contract, declarer, vulnerable, result, score))
+                raise HTTPException(status_code=400,
+                                    detail=f"Error calculating score for board {board_number}: {str(e)}")
             
-            conn.commit()
+            rows.append((table_id, round_number, board_number, contract, declarer, vulnerable, result, score))
+            results.append({"boardNumber": board_number, "score": score})
+        
+        def save_scores():
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
             
-            print(f"Score submitted: Table {table_id}, Board {board_number}, Contract {contract}, Score {score}")
-            return {"status": "success", "score": score, "message": "Score saved successfully"}
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
-        finally:
-            conn.close()
+            try:
+                cursor.executemany(SQL_UPSERT_BOARD_RESULT, rows)
+                conn.commit()
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+            finally:
+                release_tournament_conn(tournament_id, conn)
+        
+        await db_call(save_scores)
+        logger.info("Scores submitted: Table %s, %s boards", auth['table_id'], len(rows))
+        return {"status": "success", "scores": results, "message": f"{len(rows)} scores saved successfully"}
 
     @app.get("/api/table/{table_id}/round/{round_number}/results")
     async def get_table_results(table_id: int, round_number: int, request: Request):
         """Get all results entered for a table/round."""
-        # Get current tournament ID
-        m_conn = get_master_conn()
-        m_cursor = m_conn.cursor()
-        tournament_id = None
-        try:
-            m_cursor.execute("SELECT id FROM tournaments ORDER BY created_at DESC LIMIT 1")
-            tournament = m_cursor.fetchone()
-            if tournament:
-                tournament_id = tournament[0]
-        finally:
-            m_conn.close()
-            
-        if not tournament_id:
-            return {"results": [], "allComplete": False}
-        
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""SELECT board_number, contract, declarer, result, score 
-                            FROM board_results 
-                            WHERE table_id = ? AND round_number = ?
-                            ORDER BY board_number""",
-                        (table_id, round_number))
-            results_data = cursor.fetchall()
+        def read_results():
+            tournament_id = get_current_tournament_id()
+            if not tournament_id:
+                return {"results": [], "allComplete": False}
+        
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
+        
+            try:
+                cursor.execute(SQL_SELECT_TABLE_RESULTS, (table_id, round_number))
+                results_data = cursor.fetchall()
             
-            cursor.execute("SELECT boards FROM rounds WHERE table_id = ? AND round_number = ?",
-                        (table_id, round_number))
-            round_data = cursor.fetchone()
+                cursor.execute(SQL_SELECT_ROUND_BOARDS,
+                            (table_id, round_number))
+                round_data = cursor.fetchone()
             
-            all_complete = False
-            if round_data:
-                boards_str = round_data[0]
-                if '-' in boards_str:
-                    start, end = map(int, boards_str.split('-'))
-                    expected_count = end - start + 1
-                else:
-                    expected_count = 1
-                all_complete = len(results_data) >= expected_count
+                all_complete = False
+                if round_data:
+                    expected_count = len(parse_boards(round_data[0]))
+                    all_complete = len(results_data) >= expected_count
             
-            results = []
-            for row in results_data:
-                results.append({
-                    "boardNumber": row[0],
-                    "contract": row[1],
-                    "declarer": row[2],
-                    "result": row[3],
-                    "score": row[4]
-                })
+                results = [dict(zip(RESULT_KEYS, row)) for row in results_data]
             
-            return {"results": results, "allComplete": all_complete}
-        finally:
-            conn.close()
+                return {"results": results, "allComplete": all_complete}
+            finally:
+                release_tournament_reader(tournament_id, conn)
+
+        return await db_call(read_results)
 
     @app.post("/api/table/submit_round")
     async def submit_round(request: Request):
         """Mark a table's round as complete and calculate IMPs if opponent table also complete."""
-        data = await request.json()
+        data = await read_json(request)
         table_id = data.get('tableId')
         round_number = data.get('round')
         
-        # Get current tournament ID and settings
-        m_conn = get_master_conn()
-        m_cursor = m_conn.cursor()
-        tournament = None
-        try:
-            m_cursor.execute("SELECT id, boards_per_round FROM tournaments ORDER BY created_at DESC LIMIT 1")
-            tournament = m_cursor.fetchone()
-        finally:
-            m_conn.close()
-
-        if not tournament:
-            raise HTTPException(status_code=404, detail="No active tournament")
+        def mark_round_complete():
+            # Get current tournament ID and settings
+            tournament = get_current_tournament_row()
+            if not tournament:
+                raise HTTPException(status_code=404, detail="No active tournament")
         
-        tournament_id, boards_per_round = tournament[0], tournament[1]
+            tournament_id, boards_per_round = tournament[0], tournament[4]
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("UPDATE rounds SET status = 'complete' WHERE table_id = ? AND round_number = ?",
-                        (table_id, round_number))
-            conn.commit()
-            
-            if table_id % 2 == 1:
-                opponent_table = table_id + 1
-            else:
-                opponent_table = table_id - 1
-            
-            cursor.execute("SELECT status FROM rounds WHERE table_id = ? AND round_number = ?",
-                        (opponent_table, round_number))
-            opponent_status = cursor.fetchone()
-            
-            match_complete = False
-            if opponent_status and opponent_status[0] == 'complete':
-                match_complete = True
-                calculate_match_result(cursor, conn, tournament_id, table_id, opponent_table, round_number, boards_per_round)
+            try:
+                # Take the write lock up front so two tables finishing together can't
+                # both miss each other's status
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("""UPDATE rounds SET status = 'complete'
+                                  WHERE table_id = ? AND round_number = ?
+                                  RETURNING opponent_table,
+                                            (SELECT status FROM rounds AS opp
+                                             WHERE opp.table_id = rounds.opponent_table
+                                             AND opp.round_number = rounds.round_number)""",
+                               (table_id, round_number))
+                row = cursor.fetchone()
+            
+                match_complete = False
+                if row and row[1] == 'complete':
+                    opponent_table = row[0]
+                    match_complete = True
+                    calculate_match_result(cursor, tournament_id, table_id, opponent_table, round_number, boards_per_round)
+                    # Refresh cached standings for both tables so swiss pairing can read them directly
+                    cursor.execute("""INSERT INTO standings (table_id, total_vp)
+                                      SELECT table_id, SUM(vp) FROM match_results
+                                      WHERE table_id IN (?, ?)
+                                      GROUP BY table_id
+                                      ON CONFLICT(table_id) DO UPDATE SET total_vp = excluded.total_vp""",
+                                   (table_id, opponent_table))
+                conn.commit()
             
-            return {
-                "status": "success", 
-                "matchComplete": match_complete,
-                "message": "Round submitted" + (" and match results calculated" if match_complete else "")
-            }
-        finally:
-            conn.close()
+                return {
+                    "status": "success", 
+                    "matchComplete": match_complete,
+                    "message": "Round submitted" + (" and match results calculated" if match_complete else "")
+                }
+            finally:
+                release_tournament_conn(tournament_id, conn)
+
+        return await db_call(mark_round_complete)
 
     @app.get("/api/table/{table_id}/round/{round_number}/match_status")
     async def get_match_status(table_id: int, round_number: int, request: Request):
         """Get match status and results if complete."""
-        # Get current tournament ID
-        m_conn = get_master_conn()
-        m_cursor = m_conn.cursor()
-        tournament_id = None
-        try:
-            m_cursor.execute("SELECT id FROM tournaments ORDER BY created_at DESC LIMIT 1")
-            tournament = m_cursor.fetchone()
-            if tournament:
-                tournament_id = tournament[0]
-        finally:
-            m_conn.close()
-            
-        if not tournament_id:
-            return {"matchComplete": False}
+        def read_match_status():
+            tournament_id = get_current_tournament_id()
+            if not tournament_id:
+                return {"matchComplete": False}
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""SELECT total_score, opponent_score, imps, vp 
-                            FROM match_results 
-                            WHERE table_id = ? AND round_number = ?""",
-                        (table_id, round_number))
-            result = cursor.fetchone()
+            try:
+                cursor.execute(SQL_SELECT_MATCH_RESULT, (table_id, round_number))
+                result = cursor.fetchone()
             
-            if result:
-                our_vp = result[3]
-                opp_vp = 20 - our_vp
+                if result:
+                    our_vp = result[3]
+                    opp_vp = 20 - our_vp
                 
-                return {
-                    "matchComplete": True,
-                    "ourScore": result[0],
-                    "oppScore": result[1],
-                    "imps": result[2],
-                    "vp": our_vp,
-                    "oppVp": opp_vp
-                }
+                    return {
+                        "matchComplete": True,
+                        "ourScore": result[0],
+                        "oppScore": result[1],
+                        "imps": result[2],
+                        "vp": our_vp,
+                        "oppVp": opp_vp
+                    }
             
-            return {"matchComplete": False}
-        finally:
-            conn.close()
+                return {"matchComplete": False}
+            finally:
+                release_tournament_reader(tournament_id, conn)
+
+        return await db_call(read_match_status)
 
     @app.get("/api/tournament/{tournament_id}/current_round")
     async def get_current_round(tournament_id: int, request: Request):
         """Get the current round number for the tournament."""
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+        def read_current_round():
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("SELECT current_round FROM tournament_settings")
-            settings = cursor.fetchone()
+            try:
+                cursor.execute("SELECT current_round FROM tournament_settings")
+                settings = cursor.fetchone()
             
-            if settings:
-                return {"currentRound": settings[0]}
-            return {"currentRound": 1}
-        finally:
-            conn.close()
+                if settings:
+                    return {"currentRound": settings[0]}
+                return {"currentRound": 1}
+            finally:
+                release_tournament_reader(tournament_id, conn)
+
+        return await db_call(read_current_round)
 
     @app.get("/api/tournament/{tournament_id}/available_rounds")
     async def get_available_rounds(tournament_id: int, request: Request):
         """Get all available rounds for the tournament."""
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+        def read_available_rounds():
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("SELECT DISTINCT round_number FROM rounds ORDER BY round_number")
-            results = cursor.fetchall()
+            try:
+                cursor.execute("SELECT DISTINCT round_number FROM rounds ORDER BY round_number")
+                results = cursor.fetchall()
             
-            rounds = [row[0] for row in results]
+                rounds = [row[0] for row in results]
             
-            if not rounds:
-                rounds = [1]
+                if not rounds:
+                    rounds = [1]
             
-            return {"rounds": rounds}
-        finally:
-            conn.close()
+                return {"rounds": rounds}
+            finally:
+                release_tournament_reader(tournament_id, conn)
+
+        return await db_call(read_available_rounds)
 
     @app.get("/api/tournament/{tournament_id}/round/{round_number}/matchups")
     async def get_round_matchups(tournament_id: int, round_number: int, request: Request):
         """Get all matchups for a specific round."""
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""SELECT id, table_id, entry1_id, entry2_id, boards, status 
-                            FROM rounds 
-                            WHERE round_number = ?
-                            ORDER BY table_id""",
-                        (round_number,))
-            results = cursor.fetchall()
+        def read_matchups():
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
+        
+            try:
+                cursor.execute("""SELECT id, table_id, entry1_id, entry2_id, boards, status 
+                                FROM rounds 
+                                WHERE round_number = ?
+                                ORDER BY table_id""",
+                            (round_number,))
+                results = cursor.fetchall()
             
-            matchups = []
-            for row in results:
-                matchups.append({
-                    "id": row[0],
-                    "tableId": row[1],
-                    "entry1Id": row[2],
-                    "entry2Id": row[3],
-                    "boards": row[4],
-                    "status": row[5]
-                })
+                matchups = [dict(zip(MATCHUP_KEYS, row)) for row in results]
             
-            return {"matchups": matchups}
-        finally:
-            conn.close()
+                return {"matchups": matchups}
+            finally:
+                release_tournament_reader(tournament_id, conn)
+
+        return await db_call(read_matchups)
 
     @app.get("/api/tournament/{tournament_id}/round/{round_number}/all_scores")
     async def get_round_all_scores(tournament_id: int, round_number: int, request: Request):
         """Get all scores for a specific round."""
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""SELECT id, table_id, board_number, contract, declarer, result, score
-                            FROM board_results
-                            WHERE round_number = ?
-                            ORDER BY table_id, board_number""",
-                        (round_number,))
-            results = cursor.fetchall()
+        def read_all_scores():
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
+        
+            try:
+                cursor.execute("""SELECT id, table_id, board_number, contract, declarer, result, score
+                                FROM board_results
+                                WHERE round_number = ?
+                                ORDER BY table_id, board_number""",
+                            (round_number,))
+                results = cursor.fetchall()
             
-            scores = []
-            for row in results:
-                scores.append({
-                    "id": row[0],
-                    "tableId": row[1],
-                    "boardNumber": row[2],
-                    "contract": row[3],
-                    "declarer": row[4],
-                    "result": row[5],
-                    "score": row[6]
-                })
+                scores = [dict(zip(SCORE_KEYS, row)) for row in results]
             
-            return {"scores": scores}
-        finally:
-            conn.close()
+                return {"scores": scores}
+            finally:
+                release_tournament_reader(tournament_id, conn)
+
+        return await db_call(read_all_scores)
 
     @app.post("/api/score/update")
     async def update_score(request: Request, auth: dict = Depends(verify_token)):
         """Update an existing score entry - requires authentication."""
-        data = await request.json()
+        data = await read_json(request)
         
         score_id = data.get('scoreId')
         contract = data.get('contract')
@@ -710,20 +766,20 @@ def register_api_routes(app):
         if not all([score_id, contract, declarer, result is not None, score is not None]):
             raise HTTPException(status_code=422, detail="Missing required fields")
         
-        tournament_id = auth['tournament_id']
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""UPDATE board_results 
-                            SET contract = ?, declarer = ?, result = ?, score = ?
-                            WHERE id = ?""",
-                        (contract, declarer, result, score, score_id))
-            conn.commit()
+        def save_update():
+            tournament_id = auth['tournament_id']
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
+        
+            try:
+                cursor.execute(SQL_UPDATE_BOARD_RESULT, (contract, declarer, result, score, score_id))
+                conn.commit()
             
-            return {"status": "success", "message": "Score updated successfully"}
-        finally:
-            conn.close()
+                return {"status": "success", "message": "Score updated successfully"}
+            finally:
+                release_tournament_conn(tournament_id, conn)
+
+        return await db_call(save_update)
 
     @app.post("/api/matchup/update")
     async def update_matchup(request: Request):
@@ -734,7 +790,7 @@ def register_api_routes(app):
         Allows an admin or the system to change the teams/pairs assigned to a specific table 
         in a specific round (i.e., update the matchup for a table).
         """
-        data = await request.json()
+        data = await read_json(request)
         
         tournament_id = data.get('tournamentId')
         round_number = data.get('round')
@@ -745,24 +801,28 @@ def register_api_routes(app):
         if not all([tournament_id, round_number, table_id, entry1_id, entry2_id]):
             raise HTTPException(status_code=422, detail="Missing required fields")
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+        def save_matchup():
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""UPDATE rounds 
-                            SET entry1_id = ?, entry2_id = ?
-                            WHERE round_number = ? AND table_id = ?""",
-                        (entry1_id, entry2_id, round_number, table_id))
-            conn.commit()
+            try:
+                cursor.execute("""UPDATE rounds 
+                                SET entry1_id = ?, entry2_id = ?
+                                WHERE round_number = ? AND table_id = ?""",
+                            (entry1_id, entry2_id, round_number, table_id))
+                rebuild_team_history(cursor)
+                conn.commit()
             
-            return {"status": "success", "message": "Matchup updated successfully"}
-        finally:
-            conn.close()
+                return {"status": "success", "message": "Matchup updated successfully"}
+            finally:
+                release_tournament_conn(tournament_id, conn)
+
+        return await db_call(save_matchup)
 
     @app.post("/api/matchup/swap_tables")
     async def swap_tables(request: Request):
         """Swap the table numbers of two matchups."""
-        data = await request.json()
+        data = await read_json(request)
         
         tournament_id = data.get('tournamentId')
         round_number = data.get('round')
@@ -772,55 +832,57 @@ def register_api_routes(app):
         if not all([tournament_id, round_number, table1, table2]):
             raise HTTPException(status_code=422, detail="Missing required fields")
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+        def swap_matchups():
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""SELECT entry1_id, entry2_id, boards 
-                            FROM rounds 
-                            WHERE round_number = ? AND table_id = ?""",
-                        (round_number, table1))
-            matchup1 = cursor.fetchone()
-            
-            cursor.execute("""SELECT entry1_id, entry2_id, boards 
-                            FROM rounds 
-                            WHERE round_number = ? AND table_id = ?""",
-                        (round_number, table2))
-            matchup2 = cursor.fetchone()
-            
-            if not matchup1 or not matchup2:
-                raise HTTPException(status_code=404, detail="One or both tables not found")
-            
-            cursor.execute("""UPDATE rounds 
-                            SET entry1_id = ?, entry2_id = ?, boards = ?
-                            WHERE round_number = ? AND table_id = ?""",
-                        (matchup2[0], matchup2[1], matchup2[2], round_number, table1))
-            
-            cursor.execute("""UPDATE rounds 
-                            SET entry1_id = ?, entry2_id = ?, boards = ?
-                            WHERE round_number = ? AND table_id = ?""",
-                        (matchup1[0], matchup1[1], matchup1[2], round_number, table2))
-            
-            cursor.execute("""UPDATE board_results SET table_id = -1
-                            WHERE round_number = ? AND table_id = ?""",
-                        (round_number, table1))
-            cursor.execute("""UPDATE board_results SET table_id = ?
-                            WHERE round_number = ? AND table_id = ?""",
-                        (table1, round_number, table2))
-            cursor.execute("""UPDATE board_results SET table_id = ?
-                            WHERE round_number = ? AND table_id = -1""",
-                        (table2, round_number))
+            try:
+                # Hold the write lock from the read through the last UPDATE so the
+                # matchups can't change underneath the swap
+                cursor.execute("BEGIN IMMEDIATE")
+                # Every statement below filters on the same (round, table1, table2) key
+                pair_key = (round_number, table1, table2)
+                cursor.execute("""SELECT table_id, entry1_id, entry2_id, boards FROM rounds
+                                WHERE round_number = ? AND table_id IN (?, ?)""",
+                            pair_key)
+                matchups = {row[0]: row[1:] for row in cursor.fetchall()}
+                matchup1 = matchups.get(table1)
+                matchup2 = matchups.get(table2)
+            
+                if not matchup1 or not matchup2:
+                    raise HTTPException(status_code=404, detail="One or both tables not found")
+            
+                cursor.execute("""UPDATE rounds
+                                SET entry1_id = CASE table_id WHEN ? THEN ? ELSE ? END,
+                                    entry2_id = CASE table_id WHEN ? THEN ? ELSE ? END,
+                                    boards = CASE table_id WHEN ? THEN ? ELSE ? END
+                                WHERE round_number = ? AND table_id IN (?, ?)""",
+                            (table1, matchup2[0], matchup1[0],
+                             table1, matchup2[1], matchup1[1],
+                             table1, matchup2[2], matchup1[2]) + pair_key)
+            
+                # board_results is unique per (round, table, board), so park both tables'
+                # rows on negated ids before mapping each onto the other table
+                cursor.execute("""UPDATE board_results SET table_id = -table_id
+                                WHERE round_number = ? AND table_id IN (?, ?)""",
+                            pair_key)
+                cursor.execute("""UPDATE board_results
+                                SET table_id = CASE table_id WHEN ? THEN ? ELSE ? END
+                                WHERE round_number = ? AND table_id IN (?, ?)""",
+                            (-table1, table2, table1, round_number, -table1, -table2))
             
-            conn.commit()
+                conn.commit()
             
-            return {"status": "success", "message": "Tables swapped successfully"}
-        finally:
-            conn.close()
+                return {"status": "success", "message": "Tables swapped successfully"}
+            finally:
+                release_tournament_conn(tournament_id, conn)
+
+        return await db_call(swap_matchups)
 
     @app.post("/api/tournament/set_current_round")
     async def set_current_round(request: Request):
         """Set a specific round as the current tournament round."""
-        data = await request.json()
+        data = await read_json(request)
         
         tournament_id = data.get('tournamentId')
         round_number = data.get('roundNumber')
@@ -828,31 +890,31 @@ def register_api_routes(app):
         if not tournament_id or round_number is None:
             raise HTTPException(status_code=422, detail="Missing required fields")
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+        def save_current_round():
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""SELECT COUNT(*) FROM rounds 
-                             WHERE round_number = ?""",
-                        (round_number,))
-            
-            if cursor.fetchone()[0] == 0:
-                raise HTTPException(status_code=404, detail=f"Round {round_number} does not exist")
+            try:
+                # Only writes if the round exists; no row written means no such round
+                cursor.execute("""INSERT OR REPLACE INTO tournament_settings 
+                                (current_round) 
+                                SELECT ? WHERE EXISTS (SELECT 1 FROM rounds WHERE round_number = ?)""",
+                            (round_number, round_number))
             
-            cursor.execute("""INSERT OR REPLACE INTO tournament_settings 
-                            (current_round) 
-                            VALUES (?)""",
-                        (round_number,))
-            conn.commit()
+                if cursor.rowcount == 0:
+                    raise HTTPException(status_code=404, detail=f"Round {round_number} does not exist")
+                conn.commit()
             
-            return {"status": "success", "currentRound": round_number}
-        finally:
-            conn.close()
+                return {"status": "success", "currentRound": round_number}
+            finally:
+                release_tournament_conn(tournament_id, conn)
+
+        return await db_call(save_current_round)
 
     @app.post("/api/table/set_password")
     async def set_table_password(request: Request):
         """Set or update password for a table."""
-        data = await request.json()
+        data = await read_json(request)
         
         tournament_id = data.get('tournamentId')
         table_id = data.get('tableId')
@@ -861,24 +923,29 @@ def register_api_routes(app):
         if not tournament_id or not table_id or not password:
             raise HTTPException(status_code=422, detail="Missing required fields")
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+        def save_table_password():
+            password_hash = hash_password(password)
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""INSERT OR REPLACE INTO table_passwords 
-                            (table_id, password) 
-                            VALUES (?, ?)""",
-                        (table_id, password))
-            conn.commit()
+            try:
+                cursor.execute("""INSERT OR REPLACE INTO table_passwords 
+                                (table_id, password) 
+                                VALUES (?, ?)""",
+                            (table_id, password_hash))
+                conn.commit()
+                _has_password[(tournament_id, table_id)] = (True, time.monotonic())
             
-            return {"status": "success", "message": "Password set successfully"}
-        finally:
-            conn.close()
+                return {"status": "success", "message": "Password set successfully"}
+            finally:
+                release_tournament_conn(tournament_id, conn)
+
+        return await db_call(save_table_password)
 
     @app.post("/api/table/verify_password")
     async def verify_table_password(request: Request):
         """Verify password for a table and return authentication token."""
-        data = await request.json()
+        data = await read_json(request)
         
         tournament_id = data.get('tournamentId')
         table_id = data.get('tableId')
@@ -887,76 +954,65 @@ def register_api_routes(app):
         if not tournament_id or not table_id or not password:
             raise HTTPException(status_code=422, detail="Missing required fields")
         
-        t_conn = get_tournament_conn(tournament_id)
-        t_cursor = t_conn.cursor()
-        
-        try:
-            t_cursor.execute("""SELECT password FROM table_passwords 
-                            WHERE table_id = ?""",
-                        (table_id,))
-            result = t_cursor.fetchone()
-        finally:
-            t_conn.close()
-        
-        password_correct = False
-        if not result:
-            password_correct = True
-        elif result[0] == password:
-            password_correct = True
-        
-        if password_correct:
-            token = secrets.token_urlsafe(32)
-            expires_at = datetime.now() + timedelta(hours=8)
+        def check_table_password():
+            t_conn = acquire_tournament_reader(tournament_id)
+            t_cursor = t_conn.cursor()
             
-            m_conn = get_master_conn()
-            m_cursor = m_conn.cursor()
             try:
-                m_cursor.execute("""INSERT INTO session_tokens (token, tournament_id, table_id, expires_at)
-                                VALUES (?, ?, ?, ?)""",
-                            (token, tournament_id, table_id, expires_at.isoformat()))
-                m_conn.commit()
+                t_cursor.execute("""SELECT password FROM table_passwords 
+                                WHERE table_id = ?""",
+                            (table_id,))
+                result = t_cursor.fetchone()
             finally:
-                m_conn.close()
+                release_tournament_reader(tournament_id, t_conn)
             
-            return {"status": "success", "authenticated": True, "token": token}
-        else:
-            raise HTTPException(status_code=401, detail="Incorrect password")
+            password_correct = False
+            if not result:
+                password_correct = True
+            elif check_password(password, result[0]):
+                password_correct = True
+            
+            if password_correct:
+                token = create_session_token(tournament_id, table_id)
+                return {"status": "success", "authenticated": True, "token": token}
+            else:
+                raise HTTPException(status_code=401, detail="Incorrect password")
+
+        return await db_call(check_table_password)
 
     @app.get("/api/table/{table_id}/has_password")
     async def check_table_has_password(table_id: int, request: Request):
         """Check if a table requires a password."""
-        # Get current tournament ID
-        m_conn = get_master_conn()
-        m_cursor = m_conn.cursor()
-        tournament_id = None
-        try:
-            m_cursor.execute("SELECT id FROM tournaments ORDER BY created_at DESC LIMIT 1")
-            tournament = m_cursor.fetchone()
-            if tournament:
-                tournament_id = tournament[0]
-        finally:
-            m_conn.close()
+        def read_has_password():
+            tournament_id = get_current_tournament_id()
+            if not tournament_id:
+                return {"hasPassword": False}
             
-        if not tournament_id:
-            return {"hasPassword": False}
+            key = (tournament_id, table_id)
+            cached = _has_password.get(key)
+            if cached is not None and time.monotonic() - cached[1] < HAS_PASSWORD_TTL:
+                return {"hasPassword": cached[0]}
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""SELECT id FROM table_passwords 
-                            WHERE table_id = ?""",
-                        (table_id,))
-            result = cursor.fetchone()
+            try:
+                cursor.execute("""SELECT id FROM table_passwords 
+                                WHERE table_id = ?""",
+                            (table_id,))
+                result = cursor.fetchone()
+            finally:
+                release_tournament_reader(tournament_id, conn)
             
+            _has_password[key] = (result is not None, time.monotonic())
             return {"hasPassword": result is not None}
-        finally:
-            conn.close()
+
+        return await db_call(read_has_password)
 
     @app.post("/api/table/get_token")
     async def get_table_token(request: Request):
         """Get authentication token for a table without password."""
-        data = await request.json()
+        data = await read_json(request)
         
         tournament_id = data.get('tournamentId')
         table_id = data.get('tableId')
@@ -964,41 +1020,32 @@ def register_api_routes(app):
         if not tournament_id or not table_id:
             raise HTTPException(status_code=422, detail="Missing required fields")
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+        def issue_table_token():
+            conn = acquire_tournament_reader(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            # Check if table requires password
-            cursor.execute("""SELECT id FROM table_passwords 
-                            WHERE table_id = ?""",
-                        (table_id,))
-            result = cursor.fetchone()
-            
-            if result:
-                raise HTTPException(status_code=403, detail="This table requires a password")
-        finally:
-            conn.close()
-        
-        # Generate token for password-free table
-        token = secrets.token_urlsafe(32)
-        expires_at = datetime.now() + timedelta(hours=8)
-        
-        m_conn = get_master_conn()
-        m_cursor = m_conn.cursor()
-        try:
-            m_cursor.execute("""INSERT INTO session_tokens (token, tournament_id, table_id, expires_at)
-                            VALUES (?, ?, ?, ?)""",
-                        (token, tournament_id, table_id, expires_at.isoformat()))
-            m_conn.commit()
-            
+            try:
+                # Check if table requires password
+                cursor.execute("""SELECT id FROM table_passwords 
+                                WHERE table_id = ?""",
+                            (table_id,))
+                result = cursor.fetchone()
+            
+                if result:
+                    raise HTTPException(status_code=403, detail="This table requires a password")
+            finally:
+                release_tournament_reader(tournament_id, conn)
+        
+            # Generate token for password-free table
+            token = create_session_token(tournament_id, table_id)
             return {"status": "success", "token": token}
-        finally:
-            m_conn.close()
+
+        return await db_call(issue_table_token)
 
     @app.post("/api/director/verify_password")
     async def verify_director_password(request: Request):
         """Verify director password and return authentication status."""
-        data = await request.json()
+        data = await read_json(request)
         
         tournament_id = data.get('tournamentId')
         password = data.get('password')
@@ -1006,34 +1053,37 @@ def register_api_routes(app):
         if not tournament_id:
             raise HTTPException(status_code=422, detail="Missing tournament ID")
         
-        m_conn = get_master_conn()
-        m_cursor = m_conn.cursor()
+        def check_director_password():
+            m_conn = acquire_master_reader()
+            m_cursor = m_conn.cursor()
         
-        try:
-            m_cursor.execute("""SELECT director_password FROM tournaments WHERE id = ?""", (tournament_id,))
-            result = m_cursor.fetchone()
-        finally:
-            m_conn.close()
+            try:
+                m_cursor.execute("""SELECT director_password FROM tournaments WHERE id = ?""", (tournament_id,))
+                result = m_cursor.fetchone()
+            finally:
+                release_master_reader(m_conn)
         
-        if not result:
-            raise HTTPException(status_code=404, detail="Tournament not found")
+            if not result:
+                raise HTTPException(status_code=404, detail="Tournament not found")
         
-        stored_password = result[0]
+            stored_password = result[0]
         
-        # If no password is set, allow access
-        if not stored_password:
-            return {"status": "success", "authenticated": True, "message": "No password required"}
+            # If no password is set, allow access
+            if not stored_password:
+                return {"status": "success", "authenticated": True, "message": "No password required"}
         
-        # Check if provided password matches
-        if password == stored_password:
-            return {"status": "success", "authenticated": True, "message": "Password correct"}
-        else:
-            raise HTTPException(status_code=401, detail="Incorrect password")
+            # Check if provided password matches
+            if check_password(password or '', stored_password):
+                return {"status": "success", "authenticated": True, "message": "Password correct"}
+            else:
+                raise HTTPException(status_code=401, detail="Incorrect password")
+
+        return await db_call(check_director_password)
 
     @app.post("/api/tournament/advance_round")
     async def advance_round(request: Request):
         """Advance to the next round and generate new matchups using movement logic."""
-        data = await request.json()
+        data = await read_json(request)
         
         tournament_id = data.get('tournamentId')
         current_round = data.get('currentRound')
@@ -1041,83 +1091,81 @@ def register_api_routes(app):
         if not tournament_id or current_round is None:
             raise HTTPException(status_code=422, detail="Missing tournamentId or currentRound")
         
-        m_conn = get_master_conn()
-        m_cursor = m_conn.cursor()
+        def generate_next_round():
+            m_conn = acquire_master_reader()
+            m_cursor = m_conn.cursor()
         
-        try:
-            m_cursor.execute("""SELECT tournament_form, movement_type, num_entries, boards_per_round 
-                            FROM tournaments WHERE id = ?""", (tournament_id,))
-            tournament = m_cursor.fetchone()
-        finally:
-            m_conn.close()
+            try:
+                m_cursor.execute("""SELECT movement_type, num_entries, boards_per_round 
+                                FROM tournaments WHERE id = ?""", (tournament_id,))
+                tournament = m_cursor.fetchone()
+            finally:
+                release_master_reader(m_conn)
         
-        if not tournament:
-            raise HTTPException(status_code=404, detail="Tournament not found")
+            if not tournament:
+                raise HTTPException(status_code=404, detail="Tournament not found")
         
-        tournament_form, movement_type, num_entries, boards_per_round = tournament
+            movement_type, num_entries, boards_per_round = tournament
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            # Validate that all scores for current round are entered
-            cursor.execute("""SELECT COUNT(*) FROM rounds WHERE round_number = ?""",
-                        (current_round,))
-            total_matches = cursor.fetchone()[0]
-            
-            expected_results = total_matches * boards_per_round
-            
-            cursor.execute("""SELECT COUNT(*) FROM board_results 
-                            WHERE round_number = ?""",
-                        (current_round,))
-            actual_results = cursor.fetchone()[0]
-            
-            if actual_results < expected_results:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Cannot advance: {actual_results} of {expected_results} board results entered. All scores must be collected first."
-                )
-            
-            new_round = current_round + 1
-            
             try:
-                # Generate matchups based on movement type
-                if movement_type == 'round-robin':
-                    round_matchups = []
-                elif movement_type == 'swiss':
-                    round_matchups = handle_swiss(cursor, tournament_id, num_entries, new_round)
-                else:
-                    # Fallback to rotation for mitchell/howell or unknown types
-                    round_matchups = handle_rotation(num_entries, new_round)
+                new_round = current_round + 1
                 
-                # Insert new round matchups into database
-                if movement_type == 'round-robin' and tournament_form == 'teams':
-                    pass
-                else:
-                    for table_id, (entry1, entry2) in enumerate(round_matchups, start=1):
-                        start_board = (new_round - 1) * boards_per_round + 1
-                        end_board = new_round * boards_per_round
-                        boards = f"{start_board}-{end_board}"
+                # One write-lock window from validation to insert, so two concurrent
+                # advances can't both generate the next round
+                cursor.execute("BEGIN IMMEDIATE")
+                
+                # Validate that all scores for current round are entered
+                cursor.execute("""SELECT (SELECT COUNT(*) FROM rounds WHERE round_number = ?),
+                                         (SELECT COUNT(*) FROM board_results WHERE round_number = ?),
+                                         EXISTS (SELECT 1 FROM rounds WHERE round_number = ?)""",
+                            (current_round, current_round, new_round))
+                total_matches, actual_results, next_round_exists = cursor.fetchone()
+            
+                expected_results = total_matches * boards_per_round
+            
+                if actual_results < expected_results:
+                    raise HTTPException(
+                        status_code=400, 
+                        detail=f"Cannot advance: {actual_results} of {expected_results} board results entered. All scores must be collected first."
+                    )
+            
+                try:
+                    # Generate matchups based on movement type; rounds that already exist
+                    # (pre-built round robin, or a repeated advance) are left as they are
+                    if movement_type == 'round-robin' or next_round_exists:
+                        round_matchups = []
+                    elif movement_type == 'swiss':
+                        round_matchups = handle_swiss(cursor, tournament_id, num_entries, new_round)
+                    else:
+                        # Fallback to rotation for mitchell/howell or unknown types
+                        round_matchups = handle_rotation(num_entries, new_round)
+                
+                    # Insert new round matchups into database; only Swiss and rotation
+                    # generate rounds here, one row per matchup
+                    cursor.executemany(SQL_INSERT_ROUND,
+                                       matchup_rows(round_matchups, new_round, round_boards(new_round, boards_per_round)))
 
-                        cursor.execute("""INSERT INTO rounds 
-                                        (round_number, table_id, entry1_id, entry2_id, boards, status)
-                                        VALUES (?, ?, ?, ?, ?, 'pending')""",
-                                    (new_round, table_id, entry1, entry2, boards))
+                    cursor.execute("""INSERT OR REPLACE INTO tournament_settings 
+                                (current_round)
+                                VALUES (?)""",
+                            (new_round,))
+                    conn.commit()
+                    # Refresh planner statistics for the rows just added
+                    cursor.execute("PRAGMA optimize")
+                    return {
+                        "status": "success",
+                        "newRound": new_round,
+                        "message": f"Advanced to round {new_round}"
+                    }            
+                except Exception as e:
+                    raise HTTPException(status_code=500, detail=f"Error generating matchups: {str(e)}")
+            finally:
+                release_tournament_conn(tournament_id, conn)
 
-                cursor.execute("""INSERT OR REPLACE INTO tournament_settings 
-                            (current_round)
-                            VALUES (?)""",
-                        (new_round,))
-                conn.commit()
-                return {
-                    "status": "success",
-                    "newRound": new_round,
-                    "message": f"Advanced to round {new_round}"
-                }            
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"Error generating matchups: {str(e)}")
-        finally:
-            conn.close()
+        return await db_call(generate_next_round)
 
     @app.get("/api/tournament/debug_mode")
     async def get_debug_mode():
@@ -1132,126 +1180,109 @@ def register_api_routes(app):
         if not DEBUG_MODE:
             pass
         
-        data = await request.json()
+        data = await read_json(request)
         tournament_id = data.get('tournamentId')
         round_number = data.get('round')
         
         if not tournament_id or round_number is None:
             raise HTTPException(status_code=422, detail="Missing required fields")
         
-        # Get tournament info
-        m_conn = get_master_conn()
-        m_cursor = m_conn.cursor()
+        def fill_boards():
+            # Get tournament info
+            m_conn = acquire_master_conn()
+            m_cursor = m_conn.cursor()
         
-        try:
-            m_cursor.execute("SELECT boards_per_round FROM tournaments WHERE id = ?", (tournament_id,))
-            tournament = m_cursor.fetchone()
-        finally:
-            m_conn.close()
+            try:
+                m_cursor.execute("SELECT boards_per_round FROM tournaments WHERE id = ?", (tournament_id,))
+                tournament = m_cursor.fetchone()
+            finally:
+                release_master_conn(m_conn)
         
-        if not tournament:
-            raise HTTPException(status_code=404, detail="Tournament not found")
+            if not tournament:
+                raise HTTPException(status_code=404, detail="Tournament not found")
         
-        boards_per_round = tournament[0]
+            boards_per_round = tournament[0]
         
-        conn = get_tournament_conn(tournament_id)
-        cursor = conn.cursor()
+            conn = acquire_tournament_conn(tournament_id)
+            cursor = conn.cursor()
         
-        try:
-            # Get all tables for this round
-            cursor.execute("""SELECT table_id, boards FROM rounds 
-                             WHERE round_number = ?""",
-                          (round_number,))
-            tables = cursor.fetchall()
+            try:
+                # Get all tables for this round
+                cursor.execute("""SELECT table_id, boards FROM rounds 
+                                 WHERE round_number = ?""",
+                              (round_number,))
+                tables = cursor.fetchall()
             
-            filled_count = 0
+                # Boards that already have a result, for every table in the round at once
+                cursor.execute("SELECT table_id, board_number FROM board_results WHERE round_number = ?",
+                              (round_number,))
+                existing = set(cursor.fetchall())
             
-            for table_id, boards_str in tables:
-                # Parse board numbers
-                if '-' in boards_str:
-                    start, end = map(int, boards_str.split('-'))
-                    board_numbers = list(range(start, end + 1))
-                else:
-                    board_numbers = [int(boards_str)]
+                rows = []
+            
+                for table_id, boards_str in tables:
+                    board_numbers = parse_boards(boards_str)
                 
-                for board_number in board_numbers:
-                    # Check if board already has a result
-                    cursor.execute("""SELECT id FROM board_results 
-                                    WHERE table_id = ? 
-                                    AND round_number = ? AND board_number = ?""",
-                                  (table_id, round_number, board_number))
+                    for board_number in board_numbers:
+                        if (table_id, board_number) in existing:
+                            continue  # Board already has a result
                     
-                    if cursor.fetchone():
-                        continue  # Board already has a result
+                        # Generate random result
+                        level = random.randint(1, 7)
+                        suits = ['C', 'D', 'H', 'S', 'NT']
+                        suit = random.choice(suits)
                     
-                    # Generate random result
-                    level = random.randint(1, 7)
-                    suits = ['C', 'D', 'H', 'S', 'NT']
-                    suit = random.choice(suits)
+                        # 20% chance of doubled, 5% chance of redoubled
+                        rand = random.random()
+                        if rand < 0.05:
+                            double = 'XX'
+                        elif rand < 0.25:
+                            double = 'X'
+                        else:
+                            double = ''
                     
-                    # 20% chance of doubled, 5% chance of redoubled
-                    rand = random.random()
-                    if rand < 0.05:
-                        double = 'XX'
-                    elif rand < 0.25:
-                        double = 'X'
-                    else:
-                        double = ''
-                    
-                    contract = f"{level}{suit}{double}"
+                        contract = f"{level}{suit}{double}"
                     
-                    declarers = ['N', 'S', 'E', 'W']
-                    declarer = random.choice(declarers)
-                    
-                    # Calculate vulnerability
-                    vul_enum = calculate_vulnerability(board_number)
-                    vul_map = {
-                        Vul.NONE: "None",
-                        Vul.NS: "NS",
-                        Vul.EW: "EW",
-                        Vul.ALL: "Both"
-                    }
-                    vulnerability = vul_map[vul_enum]
+                        declarers = ['N', 'S', 'E', 'W']
+                        declarer = random.choice(declarers)
                     
-                    vulnerable = False
-                    if vulnerability == 'Both':
-                        vulnerable = True
-                    elif vulnerability == 'NS' and declarer in ['N', 'S']:
-                        vulnerable = True
-                    elif vulnerability == 'EW' and declarer in ['E', 'W']:
-                        vulnerable = True
+                        # Calculate vulnerability
+                        vulnerable = is_declarer_vulnerable(board_number, declarer)
                     
-                    # Generate result: 60% made, 40% down
-                    if random.random() < 0.6:
-                        # Made: level
-                        result = random.randint(level, 13)
-                    else:
-                        # Down
-                        result = random.randint(-(level + 6), -1)
+                        # Generate result: 60% made, 40% down
+                        if random.random() < 0.6:
+                            # Made: level
+                            result = random.randint(level, 13)
+                        else:
+                            # Down
+                            result = random.randint(-(level + 6), -1)
                         
-                    try:
-                        score = calculate_bridge_score(contract, vulnerable, result)
-                    except:
-                        raise HTTPException(status_code=500, detail="Error in fill_all_boards")
+                        try:
+                            score = calculate_bridge_score(contract, vulnerable, result)
+                        except:
+                            raise HTTPException(status_code=500, detail="Error in fill_all_boards")
 
-                    # Insert the result
-                    cursor.execute("""INSERT INTO board_results 
+                        rows.append((table_id, round_number, board_number,
+                                     contract, declarer, vulnerable, result, score))
+            
+                # Insert all generated results with one prepared statement
+                cursor.executemany("""INSERT INTO board_results 
                                     (table_id, round_number, board_number, 
                                      contract, declarer, vulnerable, result, score)
                                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                                  (table_id, round_number, board_number,
-                                   contract, declarer, vulnerable, result, score))
-                    filled_count += 1
-            
-            conn.commit()
+                                  rows)
+                filled_count = len(rows)
+                conn.commit()
             
-            return {
-                "status": "success",
-                "boardsFilled": filled_count,
-                "message": f"Filled {filled_count} boards with random results"
-            }
+                return {
+                    "status": "success",
+                    "boardsFilled": filled_count,
+                    "message": f"Filled {filled_count} boards with random results"
+                }
         
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error filling boards: {str(e)}")
-        finally:
-            conn.close()
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error filling boards: {str(e)}")
+            finally:
+                release_tournament_conn(tournament_id, conn)
+
+        return await db_call(fill_boards)
@@ -1,35 +1,86 @@
 from fastapi import HTTPException, Request
-from datetime import datetime
-from database import get_master_conn
+import base64
+import hashlib
+import hmac
+import os
+import time
+from database import acquire_master_reader, release_master_reader, SQL_SELECT_TOKEN_KEY
+
+# Seconds a table's session token stays valid
+TOKEN_LIFETIME = 8 * 60 * 60
+
+# Tokens are "<tournament_id>.<table_id>.<expires_at>.<signature>", signed with HMAC-SHA256
+# under a key kept in the master DB so they survive restarts and work across workers
+_token_key = None
+
+
+def _get_token_key() -> bytes:
+    global _token_key
+    if _token_key is None:
+        conn = acquire_master_reader()
+        try:
+            _token_key = conn.execute(SQL_SELECT_TOKEN_KEY).fetchone()[0]
+        finally:
+            release_master_reader(conn)
+    return _token_key
+
+
+def _sign(payload: str) -> str:
+    digest = hmac.new(_get_token_key(), payload.encode('ascii'), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
 
 
 async def verify_token(request: Request) -> dict:
     """Dependency to verify authentication token."""
     # Get token from Authorization header
-    auth_header = request.headers.get('Authorization')
+    auth_header = request.headers.get('authorization')
     if not auth_header or not auth_header.startswith('Bearer '):
         raise HTTPException(status_code=401, detail="Missing or invalid authorization token")
     
-    token = auth_header.replace('Bearer ', '')
-    
-    conn = get_master_conn()
-    cursor = conn.cursor()
-    
+    token = auth_header[7:]
+    payload, _, signature = token.rpartition('.')
     try:
-        # Check if token exists and is not expired
-        cursor.execute("""SELECT tournament_id, table_id, expires_at FROM session_tokens 
-                          WHERE token = ?""", (token,))
-        result = cursor.fetchone()
-    finally:
-        conn.close()
-    
-    if not result:
+        tournament_id, table_id, expires_at = map(int, payload.split('.'))
+    except ValueError:
         raise HTTPException(status_code=401, detail="Invalid authentication token")
     
-    tournament_id, table_id, expires_at = result
+    if not hmac.compare_digest(signature.encode(), _sign(payload).encode()):
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
     
-    # Check if token is expired
-    if datetime.fromisoformat(expires_at) < datetime.now():
+    if expires_at < time.time():
         raise HTTPException(status_code=401, detail="Authentication token expired")
     
     return {"tournament_id": tournament_id, "table_id": table_id, "token": token}
+
+
+def create_session_token(tournament_id, table_id) -> str:
+    """Return a signed session token for a table, valid for TOKEN_LIFETIME seconds."""
+    expires_at = int(time.time()) + TOKEN_LIFETIME
+    payload = f"{int(tournament_id)}.{int(table_id)}.{expires_at}"
+    return f"{payload}.{_sign(payload)}"
+
+
+# Table password hashes are stored as "pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>"
+PASSWORD_HASH_ITERATIONS = 100000
+
+
+def hash_password(password: str) -> str:
+    """Return a salted PBKDF2 hash of password for storage."""
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PASSWORD_HASH_ITERATIONS)
+    return f"pbkdf2_sha256${PASSWORD_HASH_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+
+def check_password(password: str, stored: str) -> bool:
+    """Compare password against a stored hash in constant time.
+
+    Rows written before hashing was introduced hold the plain password; those are
+    compared directly, still with compare_digest.
+    """
+    parts = stored.split('$')
+    if len(parts) != 4 or parts[0] != 'pbkdf2_sha256':
+        return hmac.compare_digest(stored.encode(), password.encode())
+    _, iterations, salt, digest = parts
+    candidate = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(candidate, bytes.fromhex(digest))
+
@@ -1,53 +1,108 @@
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
 from argparse import ArgumentParser
 from contextlib import asynccontextmanager
+import hashlib
+import logging
+import logging.handlers
+import os
+import queue
 import uvicorn
-from database import init_master_db
+from database import init_master_db, pool, reader_pool
 
 parser = ArgumentParser()
 parser.add_argument("-D", "-d", "--debug", help="Enable debug mode", action="store_true")
+parser.add_argument("command", nargs="?", choices=["migrate"],
+                    help="Run schema migrations on existing databases and exit")
 args = parser.parse_args()
 
 import api_routes
-from api_routes import register_api_routes
+from api_routes import register_api_routes, FastJSONResponse
 
 api_routes.DEBUG_MODE = args.debug
 
+# Static pages served from memory: name -> (html bytes, strong ETag)
+HTML_PAGES = ['index', 'setup', 'table_select', 'management', 'score_entry']
+
+def load_pages() -> dict:
+    pages = {}
+    for name in HTML_PAGES:
+        with open(f'html/{name}.html', 'rb') as f:
+            content = f.read()
+        pages[name] = (content, '"%s"' % hashlib.sha1(content).hexdigest())
+    return pages
+
+def html_page(request: Request, name: str) -> Response:
+    content, etag = app.state.pages[name]
+    # no-cache lets browsers keep the page but revalidate it, which costs a 304 and no body
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content, media_type='text/html', headers=headers)
+
+def start_logging():
+    """Route the "bridge" logger through a queue so handlers never write to stderr themselves.
+
+    Returns the queue handler and its listener, for shutdown.
+    """
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    logger = logging.getLogger("bridge")
+    logger.setLevel(os.environ.get("BRIDGE_LOG_LEVEL", "INFO"))
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    listener.start()
+    return queue_handler, listener
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    log_handler, log_listener = start_logging()
     # Startup: Initialize master database
     init_master_db()
+    # Warm the current-tournament cache before the first request arrives
+    api_routes.get_current_tournament_row()
+    app.state.pool = pool
+    app.state.reader_pool = reader_pool
+    app.state.pages = load_pages()
     yield
-    # Shutdown: Nothing to close globally as we use per-request connections
-    pass
+    # Shutdown: close the pooled SQLite connections
+    pool.close_all()
+    reader_pool.close_all()
+    logging.getLogger("bridge").removeHandler(log_handler)
+    log_listener.stop()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 # Register all API routes
 register_api_routes(app)
 
 
 # HTML page routes
 @app.get("/")
-async def read_index():
-    return FileResponse('html/index.html')
+async def read_index(request: Request):
+    return html_page(request, 'index')
 
 @app.get("/setup")
-async def read_setup():
-    return FileResponse('html/setup.html')
+async def read_setup(request: Request):
+    return html_page(request, 'setup')
 
 @app.get("/table_select")
-async def read_table_select():
-    return FileResponse('html/table_select.html')
+async def read_table_select(request: Request):
+    return html_page(request, 'table_select')
 
 @app.get("/management")
-async def read_management():
-    return FileResponse('html/management.html')
+async def read_management(request: Request):
+    return html_page(request, 'management')
 
 @app.get("/score_entry")
-async def read_score_entry():
-    return FileResponse('html/score_entry.html')
+async def read_score_entry(request: Request):
+    return html_page(request, 'score_entry')
 
 if __name__ == "__main__":
-    uvicorn.run('bridge_score:app', host='127.0.0.1', port=8000, reload=True)
+    if args.command == "migrate":
+        from db_migrations import migrate
+        migrate()
+    else:
+        uvicorn.run('bridge_score:app', host='127.0.0.1', port=8000, reload=True)
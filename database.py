@@ -1,21 +1,128 @@
 import sqlite3
+import logging
 import os
+from functools import lru_cache
+from db_pool import SqlitePool
 
 MASTER_DB_NAME = 'tournaments.db'
 
-def get_master_conn():
-    conn = sqlite3.connect(MASTER_DB_NAME, check_same_thread=False)
+logger = logging.getLogger("bridge")
+
+# Journal mode for every connection; set BRIDGE_SQLITE_JOURNAL=DELETE when the
+# databases live on a network filesystem where WAL's shared memory doesn't work
+SQLITE_JOURNAL_MODE = os.environ.get('BRIDGE_SQLITE_JOURNAL', 'WAL')
+
+# Applied to every connection: WAL lets readers run alongside the writer and,
+# with synchronous=NORMAL, commits no longer fsync the main database each time
+CONNECTION_PRAGMAS = f"""
+PRAGMA journal_mode={SQLITE_JOURNAL_MODE};
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-64000;
+PRAGMA cache_spill=OFF;
+PRAGMA busy_timeout=5000;
+PRAGMA foreign_keys=ON;
+"""
+
+# Prepared statements kept per connection; sqlite3 looks them up by SQL text, so
+# with pooled connections repeat queries skip re-preparation
+CACHED_STATEMENTS = 256
+
+def _connect(db_name):
+    conn = sqlite3.connect(db_name, check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+    conn.executescript(CONNECTION_PRAGMAS)
     return conn
 
+def get_master_conn():
+    return _connect(MASTER_DB_NAME)
+
+def tournament_db_name(tournament_id):
+    return f'tournament_{tournament_id}.db'
+
 def get_tournament_conn(tournament_id):
-    db_name = f'tournament_{tournament_id}.db'
-    conn = sqlite3.connect(db_name, check_same_thread=False)
+    return _connect(tournament_db_name(tournament_id))
+
+# Statements shared by several call sites or run on every score entry; one string per
+# statement means one entry in each connection's prepared-statement cache
+SQL_SELECT_ROUND_BOARDS = "SELECT boards FROM rounds WHERE table_id = ? AND round_number = ?"
+# Takes (round_number, table_id, entry1_id, entry2_id, boards); the two tables of a
+# match are 2k-1 and 2k, so each row's opponent_table is stored alongside it
+SQL_INSERT_ROUND = """INSERT INTO rounds (round_number, table_id, entry1_id, entry2_id, boards, opponent_table)
+                      VALUES (?1, ?2, ?3, ?4, ?5, CASE ?2 % 2 WHEN 1 THEN ?2 + 1 ELSE ?2 - 1 END)"""
+SQL_UPSERT_BOARD_RESULT = """INSERT INTO board_results
+                             (table_id, round_number, board_number, contract, declarer, vulnerable, result, score)
+                             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                             ON CONFLICT(round_number, table_id, board_number) DO UPDATE
+                             SET contract = excluded.contract, declarer = excluded.declarer,
+                                 vulnerable = excluded.vulnerable, result = excluded.result,
+                                 score = excluded.score"""
+SQL_UPDATE_BOARD_RESULT = """UPDATE board_results SET contract = ?, declarer = ?, result = ?, score = ?
+                             WHERE id = ?"""
+SQL_SELECT_COMPLETED_BOARDS = "SELECT board_number FROM board_results WHERE table_id = ? AND round_number = ?"
+SQL_SELECT_TABLE_RESULTS = """SELECT board_number, contract, declarer, result, score FROM board_results
+                              WHERE table_id = ? AND round_number = ?
+                              ORDER BY board_number"""
+SQL_SELECT_MATCH_SCORES = """SELECT table_id, board_number, score FROM board_results
+                             WHERE round_number = ? AND table_id IN (?, ?)
+                             AND board_number BETWEEN ? AND ?"""
+SQL_SELECT_MATCH_RESULT = """SELECT total_score, opponent_score, imps, vp FROM match_results
+                             WHERE table_id = ? AND round_number = ?"""
+SQL_SELECT_TOKEN_KEY = "SELECT value FROM app_secrets WHERE name = 'token_key'"
+# Recomputes every team's running VP total from match_results
+SQL_BACKFILL_STANDINGS = """INSERT INTO standings (table_id, total_vp)
+                            SELECT table_id, SUM(vp) FROM match_results WHERE true GROUP BY table_id
+                            ON CONFLICT(table_id) DO UPDATE SET total_vp = excluded.total_vp"""
+
+# Connections are reused across requests rather than opened per request
+pool = SqlitePool(_connect)
+
+def acquire_master_conn():
+    """Return a pooled master DB connection; hand it back with release_master_conn."""
+    return pool.acquire(MASTER_DB_NAME)
+
+def release_master_conn(conn):
+    pool.release(MASTER_DB_NAME, conn)
+
+def acquire_tournament_conn(tournament_id):
+    """Return a pooled tournament DB connection; hand it back with release_tournament_conn."""
+    return pool.acquire(tournament_db_name(tournament_id))
+
+def release_tournament_conn(tournament_id, conn):
+    pool.release(tournament_db_name(tournament_id), conn)
+
+# Read-only endpoints draw from a separate, larger set of query_only connections so
+# that under WAL they run alongside the writer instead of queueing with it
+READER_POOL_SIZE = (os.cpu_count() or 2) * 2
+
+def _connect_reader(db_name):
+    conn = _connect(db_name)
+    conn.execute('PRAGMA query_only=ON')
     return conn
 
+reader_pool = SqlitePool(_connect_reader, max_per_db=READER_POOL_SIZE)
+
+def acquire_master_reader():
+    """Return a pooled read-only master DB connection; hand it back with release_master_reader."""
+    return reader_pool.acquire(MASTER_DB_NAME)
+
+def release_master_reader(conn):
+    reader_pool.release(MASTER_DB_NAME, conn)
+
+def acquire_tournament_reader(tournament_id):
+    """Return a pooled read-only tournament DB connection; hand it back with release_tournament_reader."""
+    return reader_pool.acquire(tournament_db_name(tournament_id))
+
+def release_tournament_reader(tournament_id, conn):
+    reader_pool.release(tournament_db_name(tournament_id), conn)
+
 def init_master_db():
     conn = get_master_conn()
     cursor = conn.cursor()
     
+    # Apply the whole schema in one transaction rather than one commit per statement
+    cursor.execute('BEGIN')
+    
     # Create tournaments table
     cursor.execute('''CREATE TABLE IF NOT EXISTS tournaments
                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -28,21 +135,27 @@ def init_master_db():
                         director_password TEXT,
                         created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
                         
-    # Create session tokens table (centralized auth)
-    cursor.execute('''CREATE TABLE IF NOT EXISTS session_tokens
-                        (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        token TEXT UNIQUE NOT NULL,
-                        tournament_id INTEGER NOT NULL,
-                        table_id INTEGER NOT NULL,
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        expires_at DATETIME NOT NULL)''')
+    # Server-side secrets; token_key signs table session tokens
+    cursor.execute('''CREATE TABLE IF NOT EXISTS app_secrets
+                        (name TEXT PRIMARY KEY,
+                        value BLOB NOT NULL)''')
+    cursor.execute("INSERT OR IGNORE INTO app_secrets (name, value) VALUES ('token_key', ?)",
+                   (os.urandom(32),))
+    
+    # created_at backs the current-tournament lookup
+    cursor.execute('''CREATE INDEX IF NOT EXISTS idx_tournaments_created_at
+                        ON tournaments(created_at)''')
     
     conn.commit()
+    # Refresh planner statistics on every startup; the master DB is small enough
+    # for a full ANALYZE to be cheap
+    cursor.execute('ANALYZE')
     conn.close()
 
 def init_tournament_db(tournament_id):
     conn = get_tournament_conn(tournament_id)
     cursor = conn.cursor()
+    cursor.execute('BEGIN')
     
     # Create basic scores table
     cursor.execute('''CREATE TABLE IF NOT EXISTS scores
@@ -59,7 +172,8 @@ def init_tournament_db(tournament_id):
                         entry1_id INTEGER NOT NULL,
                         entry2_id INTEGER NOT NULL,
                         boards TEXT NOT NULL,
-                        status TEXT DEFAULT 'pending')''')
+                        status TEXT DEFAULT 'pending',
+                        opponent_table INTEGER)''')
     
     # Create board results table
     cursor.execute('''CREATE TABLE IF NOT EXISTS board_results
@@ -85,6 +199,16 @@ def init_tournament_db(tournament_id):
                         vp REAL,
                         UNIQUE(table_id, round_number))''')
     
+    # Running VP totals, refreshed whenever a match result is calculated
+    cursor.execute('''CREATE TABLE IF NOT EXISTS standings
+                        (table_id INTEGER PRIMARY KEY,
+                        total_vp REAL NOT NULL DEFAULT 0)''')
+    
+    # Opponents each team has met so far, as a JSON list, appended on pairing
+    cursor.execute('''CREATE TABLE IF NOT EXISTS team_history
+                        (team_id INTEGER PRIMARY KEY,
+                        opponents TEXT NOT NULL DEFAULT '[]')''')
+    
     # Create tournament settings table
     cursor.execute('''CREATE TABLE IF NOT EXISTS tournament_settings
                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -99,50 +223,97 @@ def init_tournament_db(tournament_id):
                         created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                         UNIQUE(table_id))''')
     
+    # Indexes for the (round_number, table_id[, board_number]) lookups every endpoint does;
+    # leading with round_number also serves the per-round scans. The rounds one carries the
+    # matchup columns so matchup reads never touch the table, and the board_results one is
+    # unique so score submissions can upsert on it.
+    cursor.execute('''CREATE INDEX IF NOT EXISTS idx_rounds_covering
+                        ON rounds(round_number, table_id, entry1_id, entry2_id, boards)''')
+    cursor.execute('''CREATE UNIQUE INDEX IF NOT EXISTS idx_board_results_round_table_board
+                        ON board_results(round_number, table_id, board_number)''')
+    # An index has no planner statistics until ANALYZE has seen it; this also covers
+    # indexes added to existing databases by `migrate`, which calls this afterwards
+    cursor.execute('ANALYZE')
+    
     conn.commit()
     conn.close()
 
-def calculate_match_result(cursor, conn, tournament_id, table1, table2, round_number, boards_per_round):
-    """Calculate IMPs and VPs for a completed match."""
-    from scoring import calculate_imp, calculate_vp
+def record_opponents(cursor, matchups) -> None:
+    """Append each side of the given (entry1, entry2) matchups to team_history."""
+    rows = []
+    for entry1, entry2 in matchups:
+        rows.append((entry1, entry2, entry2))
+        rows.append((entry2, entry1, entry1))
+    cursor.executemany("""INSERT INTO team_history (team_id, opponents)
+                          VALUES (?, json_array(?))
+                          ON CONFLICT(team_id) DO UPDATE
+                          SET opponents = json_insert(opponents, '$[#]', ?)""",
+                       rows)
+
+def rebuild_team_history(cursor) -> None:
+    """Rebuild team_history from the rounds table, e.g. after matchups are edited by hand."""
+    cursor.execute("DELETE FROM team_history")
+    cursor.execute("""INSERT INTO team_history (team_id, opponents)
+                      SELECT team_id, json_group_array(opponent)
+                      FROM (SELECT entry1_id AS team_id, entry2_id AS opponent, round_number, table_id
+                            FROM rounds
+                            UNION ALL
+                            SELECT entry2_id, entry1_id, round_number, table_id FROM rounds
+                            ORDER BY round_number, table_id)
+                      GROUP BY team_id""")
+
+@lru_cache(maxsize=256)
+def parse_boards(boards_str):
+    """Expand a rounds.boards value such as "5-8" or "3" into a range of board numbers."""
+    if '-' in boards_str:
+        start, end = map(int, boards_str.split('-'))
+        return range(start, end + 1)
+    board = int(boards_str)
+    return range(board, board + 1)
+
+def calculate_match_result(cursor, tournament_id, table1, table2, round_number, boards_per_round):
+    """Calculate IMPs and VPs for a completed match.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    from scoring import calculate_imp, calculate_imp_array, calculate_vp
     
     # Get boards for this match
-    cursor.execute("SELECT boards FROM rounds WHERE table_id = ? AND round_number = ?",
-                   (table1, round_number))
+    cursor.execute(SQL_SELECT_ROUND_BOARDS, (table1, round_number))
     boards_data = cursor.fetchone()
     if not boards_data:
         return
     
-    boards_str = boards_data[0]
-    if '-' in boards_str:
-        start, end = map(int, boards_str.split('-'))
-        board_numbers = list(range(start, end + 1))
+    board_numbers = parse_boards(boards_data[0])
+    
+    # Get results from both tables in one query, slotted by position within the round
+    start = board_numbers.start
+    table1_scores = [None] * len(board_numbers)
+    table2_scores = [None] * len(board_numbers)
+    
+    cursor.execute(SQL_SELECT_MATCH_SCORES,
+                   (round_number, table1, table2, start, board_numbers.stop - 1))
+    for table_id, board, score in cursor.fetchall():
+        (table1_scores if table_id == table1 else table2_scores)[board - start] = score
+    
+    # One pass for both tables' totals and the boards both tables have played
+    table1_total = table2_total = 0
+    played1 = []
+    played2 = []
+    for score1, score2 in zip(table1_scores, table2_scores):
+        if score1 is not None:
+            table1_total += score1
+        if score2 is not None:
+            table2_total += score2
+            if score1 is not None:
+                played1.append(score1)
+                played2.append(score2)
+    
+    # Calculate total IMPs over the boards both tables have played
+    if len(played1) == 1:
+        total_imps = calculate_imp(played1[0], played2[0])
     else:
-        board_numbers = [int(boards_str)]
-    
-    # Get results from both tables
-    table1_scores = {}
-    table2_scores = {}
-    
-    for board in board_numbers:
-        cursor.execute("SELECT score FROM board_results WHERE table_id = ? AND round_number = ? AND board_number = ?",
-                       (table1, round_number, board))
-        result1 = cursor.fetchone()
-        if result1:
-            table1_scores[board] = result1[0]
-        
-        cursor.execute("SELECT score FROM board_results WHERE table_id = ? AND round_number = ? AND board_number = ?",
-                       (table2, round_number, board))
-        result2 = cursor.fetchone()
-        if result2:
-            table2_scores[board] = result2[0]
-    
-    # Calculate total IMPs
-    total_imps = 0
-    for board in board_numbers:
-        if board in table1_scores and board in table2_scores:
-            imp = calculate_imp(table1_scores[board], table2_scores[board])
-            total_imps += imp
+        total_imps = int(calculate_imp_array(played1, played2).sum())
     
     # Calculate VPs
     vp1, vp2 = calculate_vp(total_imps, 0, boards_per_round)
@@ -150,26 +321,22 @@ def calculate_match_result(cursor, conn, tournament_id, table1, table2, round_nu
     # Store match results in rounds table
     cursor.execute("""UPDATE rounds 
                       SET status = 'complete_with_result'
-                      WHERE table_id = ? AND round_number = ?""",
-                   (table1, round_number))
-    cursor.execute("""UPDATE rounds 
-                      SET status = 'complete_with_result'
-                      WHERE table_id = ? AND round_number = ?""",
-                   (table2, round_number))
-    
-    # Calculate total scores
-    table1_total = sum(table1_scores.values())
-    table2_total = sum(table2_scores.values())
+                      WHERE round_number = ? AND table_id IN (?, ?)""",
+                   (round_number, table1, table2))
     
     # Store results for both tables
-    cursor.execute("""INSERT OR REPLACE INTO match_results 
-                      (table_id, round_number, total_score, opponent_score, imps, vp)
-                      VALUES (?, ?, ?, ?, ?, ?)""",
-                   (table1, round_number, table1_total, table2_total, total_imps, vp1))
-    cursor.execute("""INSERT OR REPLACE INTO match_results 
-                      (table_id, round_number, total_score, opponent_score, imps, vp)
-                      VALUES (?, ?, ?, ?, ?, ?)""",
-                   (table2, round_number, table2_total, table1_total, -total_imps, vp2))
+    cursor.executemany("""INSERT INTO match_results 
+                          (table_id, round_number, total_score, opponent_score, imps, vp)
+                          VALUES (?, ?, ?, ?, ?, ?)
+                          ON CONFLICT(table_id, round_number) DO UPDATE
+                          SET total_score = excluded.total_score, opponent_score = excluded.opponent_score,
+                              imps = excluded.imps, vp = excluded.vp
+                          WHERE (match_results.total_score, match_results.opponent_score,
+                                 match_results.imps, match_results.vp)
+                                IS NOT (excluded.total_score, excluded.opponent_score,
+                                        excluded.imps, excluded.vp)""",
+                       [(table1, round_number, table1_total, table2_total, total_imps, vp1),
+                        (table2, round_number, table2_total, table1_total, -total_imps, vp2)])
     
-    conn.commit()
-    print(f"Match result calculated: Table {table1} vs {table2}, IMPs: {total_imps}, VPs: {vp1:.2f} - {vp2:.2f}")
+    logger.info("Match result calculated: Table %s vs %s, IMPs: %s, VPs: %.2f - %.2f",
+                table1, table2, total_imps, vp1, vp2)
@@ -0,0 +1,93 @@
+"""
+One-shot schema migrations for databases created by older versions.
+
+Run once before deploying, not from the server's startup:
+
+    python bridge_score.py migrate
+"""
+
+from database import (get_master_conn, get_tournament_conn, init_master_db, init_tournament_db,
+                      rebuild_team_history, SQL_BACKFILL_STANDINGS)
+
+
+def migrate_master(conn):
+    cursor = conn.cursor()
+    cursor.execute('BEGIN')
+
+    # Session tokens are signed now rather than stored
+    cursor.execute('DROP TABLE IF EXISTS session_tokens')
+
+    conn.commit()
+
+
+def migrate_tournament(conn):
+    cursor = conn.cursor()
+    cursor.execute('BEGIN')
+
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(rounds)')}
+    if 'opponent_table' not in columns:
+        cursor.execute('ALTER TABLE rounds ADD COLUMN opponent_table INTEGER')
+        cursor.execute('''UPDATE rounds SET opponent_table =
+                            CASE table_id % 2 WHEN 1 THEN table_id + 1 ELSE table_id - 1 END''')
+
+    # Replaced by idx_rounds_covering
+    cursor.execute('DROP INDEX IF EXISTS idx_rounds_round_table')
+
+    # Keep only the latest result per board so the unique index can be built
+    cursor.execute('''DELETE FROM board_results WHERE id NOT IN
+                        (SELECT MAX(id) FROM board_results
+                         GROUP BY round_number, table_id, board_number)''')
+
+    conn.commit()
+
+
+def backfill_tournament(conn):
+    """Fill the derived tables for a tournament that predates them; run after init_tournament_db."""
+    cursor = conn.cursor()
+    cursor.execute('BEGIN')
+
+    # Swiss pairing reads running VP totals from standings rather than match_results
+    cursor.execute(SQL_BACKFILL_STANDINGS)
+
+    # ...and opponent history from team_history rather than rounds
+    rebuild_team_history(cursor)
+
+    conn.commit()
+
+
+def migrate():
+    """Migrate the master DB and every tournament DB it lists, then bring their schemas up to date."""
+    conn = get_master_conn()
+    try:
+        migrate_master(conn)
+    finally:
+        conn.close()
+    init_master_db()
+
+    conn = get_master_conn()
+    try:
+        tournament_ids = [row[0] for row in conn.execute('SELECT id FROM tournaments')]
+    finally:
+        conn.close()
+
+    for tournament_id in tournament_ids:
+        conn = get_tournament_conn(tournament_id)
+        try:
+            existing = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'rounds'").fetchone()
+            if existing:
+                migrate_tournament(conn)
+        finally:
+            conn.close()
+        init_tournament_db(tournament_id)
+
+        if existing:
+            conn = get_tournament_conn(tournament_id)
+            try:
+                backfill_tournament(conn)
+            finally:
+                conn.close()
+        print(f"Migrated tournament {tournament_id}")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,88 @@
+"""
+Bounded pool of reusable SQLite connections, one idle stack per database file.
+"""
+
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class SqlitePool:
+    """
+    Hands out sqlite3 connections and keeps released ones for reuse.
+
+    Each database file gets a LIFO stack of at most max_per_db idle connections,
+    so the most recently used (and warmest) connection is handed out first. When
+    more than max_dbs files have idle stacks, the least recently used file's
+    connections are closed.
+    """
+
+    def __init__(self, connect, max_per_db: int = 8, max_dbs: int = 32):
+        self._connect = connect
+        self.max_per_db = max_per_db
+        self.max_dbs = max_dbs
+        self._idle = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, db_name: str):
+        """Return an idle connection to db_name, opening a new one if none is free."""
+        with self._lock:
+            idle = self._idle.get(db_name)
+            if idle is None:
+                idle = self._idle[db_name] = queue.LifoQueue(maxsize=self.max_per_db)
+            self._idle.move_to_end(db_name)
+            evicted = []
+            while len(self._idle) > self.max_dbs:
+                evicted.append(self._idle.popitem(last=False)[1])
+
+        for stack in evicted:
+            self._close_queue(stack)
+
+        try:
+            return idle.get_nowait()
+        except queue.Empty:
+            return self._connect(db_name)
+
+    def release(self, db_name: str, conn) -> None:
+        """Roll back any uncommitted work and return conn to its idle stack."""
+        try:
+            conn.rollback()
+        except Exception:
+            conn.close()
+            return
+
+        with self._lock:
+            idle = self._idle.get(db_name)
+        if idle is None:
+            conn.close()
+            return
+        try:
+            idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    @contextmanager
+    def conn_for(self, db_name: str):
+        """Context manager form of acquire/release."""
+        conn = self.acquire(db_name)
+        try:
+            yield conn
+        finally:
+            self.release(db_name, conn)
+
+    def close_all(self) -> None:
+        """Close every idle connection; used at application shutdown."""
+        with self._lock:
+            stacks = list(self._idle.values())
+            self._idle.clear()
+        for stack in stacks:
+            self._close_queue(stack)
+
+    @staticmethod
+    def _close_queue(stack) -> None:
+        while True:
+            try:
+                stack.get_nowait().close()
+            except queue.Empty:
+                return
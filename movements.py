@@ -4,9 +4,14 @@ Handles round robin, Swiss system, and table assignments.
 """
 
 from typing import List, Tuple, Dict
+from functools import lru_cache
 import random
 from scipy.optimize import milp, Bounds, LinearConstraint
 
+# Fields larger than this are paired greedily down the standings instead of by MILP,
+# whose pair variables grow quadratically with the number of teams
+SWISS_FAST_THRESHOLD = 60
+
 
 def assign_table_pairs(team_ids: List[int], round_number: int = 1, bye_team: int = None) -> List[Tuple[int, str, int, int]]:
     """
@@ -45,7 +50,7 @@ def assign_table_pairs(team_ids: List[int], round_number: int = 1, bye_team: int
         team2 = teams[i + 1]
         
         # Skip if either team is the bye team
-        if (bye_team is not None and (team1 == bye_team or team2 == bye_team)):
+        if bye_team in (team1, team2):
             continue
         
         # Open room: Team1 (NS) vs Team2 (EW)
@@ -97,25 +102,24 @@ def round_robin(num_teams: int, bye_team: int = None) -> List[List[Tuple[int, in
             bye_team = num_teams + 1
         teams.append(bye_team)
     
+    import numpy as np
+    
     num_rounds = len(teams) - 1
     half = len(teams) // 2
     
-    schedule = []
+    # The first team stays fixed while the rest rotate one seat per round; in round r,
+    # seat p (1-based among the rest) holds rest[(p - 1 - r) % k]. Every round's seats
+    # are computed at once as a (round, match) grid.
+    rest = np.array(teams[1:])
+    k = len(rest)
+    r = np.arange(num_rounds)[:, None]
+    i = np.arange(half)[None, :]
     
-    for round_num in range(num_rounds):
-        round_pairings = []
-        
-        for i in range(half):
-            team1 = teams[i]
-            team2 = teams[len(teams) - 1 - i]
-            round_pairings.append((team1, team2))
-        
-        schedule.append(round_pairings)
-        
-        # Rotate teams (keep first team fixed, rotate others)
-        teams = [teams[0]] + [teams[-1]] + teams[1:-1]
+    team1 = rest[(i - 1 - r) % k]
+    team1[:, 0] = teams[0]
+    team2 = rest[(k - 1 - i - r) % k]
     
-    return schedule
+    return [list(zip(row1, row2)) for row1, row2 in zip(team1.tolist(), team2.tolist())]
 
 
 def round_robin_with_tables(num_teams: int, bye_team: int = None) -> List[List[Tuple[int, str, int, int]]]:
@@ -158,22 +162,16 @@ def round_robin_with_tables(num_teams: int, bye_team: int = None) -> List[List[T
     if num_teams % 2 == 1 and bye_team is None:
         bye_team = num_teams + 1
     
-    # Add table numbers and create open/closed rooms, excluding bye matches
+    # Number each round's non-bye matches as tables, each with an open room
+    # (team1 NS vs team2 EW) and a closed room (team2 NS vs team1 EW)
     schedule_with_tables = []
     for round_pairings in schedule:
-        round_with_tables = []
-        table_num = 1
-        for (team1, team2) in round_pairings:
-            # Skip if either team is the bye team
-            if bye_team is not None and (team1 == bye_team or team2 == bye_team):
-                continue
-            
-            # Open room: Team1 (NS) vs Team2 (EW)
-            round_with_tables.append((table_num, 'open', team1, team2))
-            # Closed room: Team2 (NS) vs Team1 (EW)
-            round_with_tables.append((table_num, 'closed', team2, team1))
-            table_num += 1
-        schedule_with_tables.append(round_with_tables)
+        matches = [(team1, team2) for team1, team2 in round_pairings if bye_team not in (team1, team2)]
+        schedule_with_tables.append([
+            (table_num, room, team_ns, team_ew)
+            for table_num, (team1, team2) in enumerate(matches, 1)
+            for room, team_ns, team_ew in (('open', team1, team2), ('closed', team2, team1))
+        ])
     
     return schedule_with_tables
 
@@ -183,10 +181,11 @@ def swiss_pairing(
     standings: Dict[int, float],
     previous_opponents: Dict[int, List[int]],
     round_number: int,
-    bye_team: int = None
+    bye_team: int = None,
+    room_filter: str = None
 ) -> List[Tuple[int, str, int, int]]:
     """
-    Generate Swiss system pairings based on current standings using MILP optimization.
+    Generate Swiss system pairings based on current standings as a minimum-cost perfect matching.
     Teams with similar scores are paired together, avoiding rematches.
     Creates duplicate bridge tables (open and closed rooms).
     
@@ -195,9 +194,11 @@ def swiss_pairing(
     Args:
         team_ids: List of all team IDs in the tournament (should be even, or include bye_team)
         standings: Dictionary mapping team_id to current VP (Victory Points)
-        previous_opponents: Dictionary mapping team_id to list of team_ids they've already played
+        previous_opponents: Dictionary mapping team_id to the team_ids they've already played
+            (a set, or any iterable)
         round_number: Current round number
         bye_team: Optional bye team ID. Matches with bye team won't get table assignments.
+        room_filter: Optional 'open' or 'closed' to return only that room, one entry per match
     
     Returns:
         List of tuples: (table_number, room, team_ns, team_ew)
@@ -209,171 +210,225 @@ def swiss_pairing(
     if len(team_ids) % 2 != 0:
         raise ValueError("Number of teams must be even. Use bye_team parameter for odd team counts.")
     
+    if len(team_ids) > SWISS_FAST_THRESHOLD:
+        # Shuffle first so the stable sort in the greedy pass breaks VP ties randomly
+        return _greedy_swiss_pairing(random.sample(team_ids, len(team_ids)), standings,
+                                     previous_opponents, bye_team, room_filter)
+    
     import numpy as np
     
     n = len(team_ids)
-    num_pairs = n * (n - 1) // 2
     
     # Create VP array sorted by team_ids
-    vps = [standings.get(team_id, 0) for team_id in team_ids]
+    vps = np.array([standings.get(team_id, 0) for team_id in team_ids], dtype=float)
     
-    # Build history set of (i, j) where i and j are indices in team_ids
+    # Index pairs (into team_ids) that have already played
     team_to_idx = {team_id: idx for idx, team_id in enumerate(team_ids)}
-    history = set()
+    played_i = []
+    played_j = []
     for team_id, opponents in previous_opponents.items():
-        if team_id in team_to_idx:
-            i = team_to_idx[team_id]
-            for opp_id in opponents:
-                if opp_id in team_to_idx:
-                    j = team_to_idx[opp_id]
-                    if i < j:
-                        history.add((i, j))
-                    else:
-                        history.add((j, i))
-    
-    # Map (i, j) pairs to indices in the x vector
-    pair_to_idx = {}
-    idx_to_pair = []
-    curr = 0
-    for i in range(n):
-        for j in range(i + 1, n):
-            pair_to_idx[(i, j)] = curr
-            idx_to_pair.append((i, j))
-            curr += 1
+        i = team_to_idx.get(team_id)
+        if i is None:
+            continue
+        for opp_id in opponents:
+            j = team_to_idx.get(opp_id)
+            if j is not None:
+                played_i.append(i)
+                played_j.append(j)
 
-    # 1. Objective Function (Costs)
-    # Minimize the square of VP differences
-    costs = np.zeros(num_pairs)
+    # Cost of pairing i with j: the square of their VP difference, or a huge penalty
+    # for a rematch
+    cost = (vps[:, None] - vps[None, :]) ** 2
     huge_penalty = 1e6 
+    cost[played_i, played_j] = huge_penalty
+    cost[played_j, played_i] = huge_penalty
+
+    matches = _assignment_matching(cost)
+    if matches is None:
+        matches = _milp_matching(cost)
+    if matches is None:
+        # Fallback to greedy approach
+        return _greedy_swiss_pairing(team_ids, standings, previous_opponents, bye_team, room_filter)
     
-    for idx, (i, j) in enumerate(idx_to_pair):
-        diff = (vps[i] - vps[j])**2
-        # If they've played before, add the penalty
-        if (i, j) in history or (j, i) in history:
-            costs[idx] = huge_penalty
-        else:
-            costs[idx] = diff
+    # Drop the bye match, then sort by VP sum (descending) for table assignment;
+    # higher VP sum gets a lower table number, ties going to the higher indices
+    ids = np.array(team_ids)
+    i, j = np.array(matches).T
+    playing = (ids[i] != bye_team) & (ids[j] != bye_team)
+    i, j = i[playing], j[playing]
+    order = np.lexsort((-j, -i, -(vps[i] + vps[j])))
+    
+    # Convert index pairs back to team IDs and create table pairings
+    pairings = []
+    for table_number, k in enumerate(order.tolist(), 1):
+        team1 = team_ids[i[k]]
+        team2 = team_ids[j[k]]
+        
+        # Open room: Team1 (NS) vs Team2 (EW)
+        if room_filter != 'closed':
+            pairings.append((table_number, 'open', team1, team2))
+        # Closed room: Team2 (NS) vs Team1 (EW)
+        if room_filter != 'open':
+            pairings.append((table_number, 'closed', team2, team1))
+    
+    return pairings
+
+
+def _assignment_matching(cost) -> List[Tuple[int, int]]:
+    """
+    Minimum-cost perfect matching on a symmetric cost matrix via linear_sum_assignment.
+
+    The optimal assignment is a set of cycles costing at most twice the best matching.
+    2-cycles are pairs, and every longer even cycle splits into two alternating
+    matchings, one costing at most half the cycle. Together those form an optimal
+    matching. Returns None if the assignment contains an odd cycle.
+    """
+    import numpy as np
+    from scipy.optimize import linear_sum_assignment
+    
+    cost = cost.copy()
+    np.fill_diagonal(cost, np.inf)
+    _, perm = linear_sum_assignment(cost)
+    perm = perm.tolist()
+    
+    matches = []
+    seen = [False] * len(perm)
+    for start in range(len(perm)):
+        cycle = []
+        node = start
+        while not seen[node]:
+            seen[node] = True
+            cycle.append(node)
+            node = perm[node]
+        if len(cycle) % 2:
+            return None
+        evens = [(cycle[k], cycle[k + 1]) for k in range(0, len(cycle), 2)]
+        odds = [(cycle[k + 1], cycle[(k + 2) % len(cycle)]) for k in range(0, len(cycle), 2)]
+        if sum(cost[a, b] for a, b in odds) < sum(cost[a, b] for a, b in evens):
+            evens = odds
+        matches.extend((min(a, b), max(a, b)) for a, b in evens)
+    return sorted(matches)
+
 
-    # 2. Constraints: Each team appears exactly once
-    # A * x = 1
-    A = np.zeros((n, num_pairs))
-    for idx, (i, j) in enumerate(idx_to_pair):
-        A[i, idx] = 1
-        A[j, idx] = 1
+@lru_cache(maxsize=16)
+def _matching_model(n: int) -> tuple:
+    """
+    The parts of the matching MILP that depend only on the field size, cached
+    across rounds: candidate pairs (I[k], J[k]) with I < J, the constraint that
+    each team appears exactly once, integrality and bounds.
+    """
+    import numpy as np
+    from scipy import sparse
     
+    I, J = np.triu_indices(n, k=1)
+    I.flags.writeable = J.flags.writeable = False
+    num_pairs = I.size
+
+    # A * x = 1, where column k has a 1 in rows I[k] and J[k]; CSC is the layout HiGHS uses
+    cols = np.arange(num_pairs)
+    A = sparse.csc_matrix((np.ones(2 * num_pairs), (np.concatenate([I, J]), np.concatenate([cols, cols]))),
+                          shape=(n, num_pairs))
     constraints = LinearConstraint(A, lb=1, ub=1)
     
-    # 3. Integrality (x must be 0 or 1)
+    # x must be 0 or 1
     integrality = np.ones(num_pairs) # 1 means integer constraint
     bounds = Bounds(0, 1)
+    
+    return I, J, constraints, integrality, bounds
 
-    res = milp(c=costs, constraints=constraints, integrality=integrality, bounds=bounds)
 
+def _milp_matching(cost) -> List[Tuple[int, int]]:
+    """Minimum-cost perfect matching on a symmetric cost matrix solved as a MILP; None on failure."""
+    I, J, constraints, integrality, bounds = _matching_model(cost.shape[0])
+
+    res = milp(c=cost[I, J], constraints=constraints, integrality=integrality, bounds=bounds)
     if not res.success:
-        # Fallback to greedy approach
-        return _greedy_swiss_pairing(team_ids, standings, previous_opponents, bye_team)
-    
-    # Extract matches from result
-    matches = [idx_to_pair[i] for i, val in enumerate(res.x) if val > 0.5]
-    
-    # Sort matches by VP sum (descending) for table assignment
-    # Higher VP sum gets lower table number
-    matches_with_vp = []
-    for (i, j) in matches:
-        team1 = team_ids[i]
-        team2 = team_ids[j]
-        
-        # Skip if either team is the bye team
-        if bye_team is not None and (team1 == bye_team or team2 == bye_team):
-            continue
-        
-        vp_sum = standings.get(team1, 0) + standings.get(team2, 0)
-        matches_with_vp.append((vp_sum, i, j))
+        return None
     
-    # Sort by VP sum descending
-    matches_with_vp.sort(reverse=True)
+    selected = res.x > 0.5
+    return list(zip(I[selected].tolist(), J[selected].tolist()))
+
+
+def swiss_pairing_fast(
+    team_ids: List[int],
+    standings: Dict[int, float],
+    previous_opponents: Dict[int, List[int]],
+    round_number: int,
+    bye_team: int = None,
+    room_filter: str = None
+) -> List[Tuple[int, str, int, int]]:
+    """
+    Swiss pairing in a single pass down the standings, for very large fields.
     
-    # Convert index pairs back to team IDs and create table pairings
-    pairings = []
-    table_number = 1
+    Teams are ranked by VP (ties by team ID) and each is paired with the highest-ranked
+    unpaired team below it that it hasn't played. This is O(N log N + N*R) rather than a
+    matching over all pairs, but a rematch is accepted when no other opponent is left.
+    Arguments and return value are as for swiss_pairing.
+    """
+    if len(team_ids) < 2:
+        raise ValueError("Need at least 2 teams for Swiss pairing")
     
-    for (vp_sum, i, j) in matches_with_vp:
-        team1 = team_ids[i]
-        team2 = team_ids[j]
-        
-        # Open room: Team1 (NS) vs Team2 (EW)
-        pairings.append((table_number, 'open', team1, team2))
-        # Closed room: Team2 (NS) vs Team1 (EW)
-        pairings.append((table_number, 'closed', team2, team1))
-        table_number += 1
+    if len(team_ids) % 2 != 0:
+        raise ValueError("Number of teams must be even. Use bye_team parameter for odd team counts.")
     
-    return pairings
+    return _greedy_swiss_pairing(sorted(team_ids), standings, previous_opponents, bye_team, room_filter)
 
 
 def _greedy_swiss_pairing(
     team_ids: List[int],
     standings: Dict[int, float],
     previous_opponents: Dict[int, List[int]],
-    bye_team: int = None
+    bye_team: int = None,
+    room_filter: str = None
 ) -> List[Tuple[int, str, int, int]]:
     """
-    Greedy fallback for Swiss pairing when MILP fails.
+    Greedy fallback for Swiss pairing when MILP fails, and the pairing used for
+    fields above SWISS_FAST_THRESHOLD.
     """
     # Sort teams by standings (highest first)
     sorted_teams = sorted(team_ids, key=lambda x: standings.get(x, 0), reverse=True)
+    n = len(sorted_teams)
     
     pairings = []
     table_number = 1
-    paired = set()
+    paired = [False] * n
     
-    for team1 in sorted_teams:
-        if team1 in paired:
+    # Every team ranked above team1 is already paired by the time team1 comes up,
+    # so opponents are only searched for below it
+    for i, team1 in enumerate(sorted_teams):
+        if paired[i]:
             continue
         
-        # Find best opponent for team1
-        team1_opponents = previous_opponents.get(team1, [])
-        
-        # Try to pair with closest-ranked team that hasn't been played
-        for team2 in sorted_teams:
-            if team2 == team1 or team2 in paired:
+        # Closest-ranked team that hasn't been played, else the closest anyway
+        team1_opponents = previous_opponents.get(team1, ())
+        if not isinstance(team1_opponents, (set, frozenset)):
+            team1_opponents = set(team1_opponents)
+        closest = None
+        for j in range(i + 1, n):
+            if paired[j]:
                 continue
-            
-            # Check if they haven't played before
-            if team2 not in team1_opponents:
-                # Skip if either team is the bye team
-                if bye_team is not None and (team1 == bye_team or team2 == bye_team):
-                    paired.add(team1)
-                    paired.add(team2)
-                    break
-                
-                # Open room: Team1 (NS) vs Team2 (EW)
-                pairings.append((table_number, 'open', team1, team2))
-                # Closed room: Team2 (NS) vs Team1 (EW)
-                pairings.append((table_number, 'closed', team2, team1))
-                paired.add(team1)
-                paired.add(team2)
-                table_number += 1
+            if closest is None:
+                closest = j
+            if sorted_teams[j] not in team1_opponents:
                 break
         else:
-            # No valid opponent found (all have been played), pair with closest anyway
-            for team2 in sorted_teams:
-                if team2 == team1 or team2 in paired:
-                    continue
-                
-                # Skip if either team is the bye team
-                if bye_team is not None and (team1 == bye_team or team2 == bye_team):
-                    paired.add(team1)
-                    paired.add(team2)
-                    break
-                
-                # Open room: Team1 (NS) vs Team2 (EW)
-                pairings.append((table_number, 'open', team1, team2))
-                # Closed room: Team2 (NS) vs Team1 (EW)
-                pairings.append((table_number, 'closed', team2, team1))
-                paired.add(team1)
-                paired.add(team2)
-                table_number += 1
-                break
+            if closest is None:
+                continue
+            j = closest
+        team2 = sorted_teams[j]
+        paired[i] = paired[j] = True
+        
+        # A match against the bye team gets no tables
+        if bye_team in (team1, team2):
+            continue
+        
+        # Open room: Team1 (NS) vs Team2 (EW)
+        if room_filter != 'closed':
+            pairings.append((table_number, 'open', team1, team2))
+        # Closed room: Team2 (NS) vs Team1 (EW)
+        if room_filter != 'open':
+            pairings.append((table_number, 'closed', team2, team1))
+        table_number += 1
     
     return pairings
 
@@ -411,33 +466,23 @@ def knockout_bracket(team_ids: List[int], seeded: bool = False) -> List[List[Tup
         # For simplicity, just raise error
         raise ValueError(f"Knockout requires power of 2 teams. Got {num_teams}, need {next_power}")
     
-    teams = team_ids.copy()
-    
     if seeded:
         # Seed pairing: 1 vs N, 2 vs N-1, etc.
-        pass
+        teams = [team for k in range(num_teams // 2) for team in (team_ids[k], team_ids[-1 - k])]
     else:
         # Random bracket
-        random.shuffle(teams)
+        teams = random.sample(team_ids, num_teams)
     
-    rounds = []
+    # A bracket of 2**k teams has exactly k rounds
+    num_rounds = num_teams.bit_length() - 1
+    rounds = [None] * num_rounds
     current_round = teams
     
-    while len(current_round) > 1:
-        round_pairings = []
-        next_round = []
-        table_num = 1
-        
-        for i in range(0, len(current_round), 2):
-            team1 = current_round[i]
-            team2 = current_round[i + 1]
-            round_pairings.append((table_num, team1, team2))
-            # For now, just use team1 as placeholder winner
-            next_round.append(team1)
-            table_num += 1
-        
-        rounds.append(round_pairings)
-        current_round = next_round
+    for round_index in range(num_rounds):
+        rounds[round_index] = [(table_num, team1, team2) for table_num, (team1, team2)
+                               in enumerate(zip(current_round[0::2], current_round[1::2]), 1)]
+        # For now, just use team1 as placeholder winner
+        current_round = current_round[0::2]
     
     return rounds
 
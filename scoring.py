@@ -1,7 +1,8 @@
 import numpy as np
 import math
 from enum import Enum
-import re
+from bisect import bisect_right
+from functools import lru_cache
 
 class Vul(Enum):
     NONE = 0
@@ -9,6 +10,10 @@ class Vul(Enum):
     EW = 2
     ALL = 3
 
+MINOR_SUITS = frozenset(('C', 'D'))
+MAJOR_SUITS = frozenset(('H', 'S'))
+DOUBLE_MULTIPLIERS = {'': 1, 'X': 2, 'XX': 4}
+
 def calculate_bridge_score(contract: str, vulnerable: bool, tricks: int) -> int:
     """
     Calculate the score for a bridge contract result.
@@ -25,34 +30,52 @@ def calculate_bridge_score(contract: str, vulnerable: bool, tricks: int) -> int:
     if not (contract and vulnerable is not None and isinstance(tricks, int)): 
         assert False, "Invalid input format. Expected format: '<contract> <vulnerability> <tricks made/undertricks>'"    
     
-    # Parse contract
-    # Support for doubled (X) and redoubled (XX) contracts
-    m = re.match(r"(\d+)(NT|[CDHS])(X{0,2})", contract.upper())
-    if not m:
+    return _cached_score(contract, bool(vulnerable), tricks)
+
+# Kept apart from calculate_bridge_score so the type check above runs on every call;
+# 4.0 hashes like 4 and would otherwise be answered from the cache
+@lru_cache(maxsize=4096)
+def _cached_score(contract: str, vulnerable: bool, tricks: int) -> int:
+    level, suit, dbl = _parse_contract(contract)
+    score = _SCORE_TABLE.get((level, suit, dbl, bool(vulnerable), tricks))
+    if score is None:
+        score = _contract_score(level, suit, dbl, vulnerable, tricks)
+    return score
+
+@lru_cache(maxsize=256)
+def _parse_contract(contract: str) -> tuple:
+    """Split a contract string into (level, suit, dbl)."""
+    # A level digit, the strain, then X (doubled) or XX (redoubled)
+    upper = contract.upper()
+    if upper[:1] not in ('1', '2', '3', '4', '5', '6', '7'):
         assert False, "Invalid contract format: {}".format(contract)
-    level = int(m.group(1))
-    suit = m.group(2)
-    dbl = m.group(3)
-    
-    # Determine multiplier
-    if dbl == 'X':
-        multiplier = 2
-    elif dbl == 'XX':
-        multiplier = 4
+    level = int(upper[0])
+    if upper[1:3] == 'NT':
+        suit = 'NT'
+        rest = upper[3:]
+    elif upper[1:2] in ('C', 'D', 'H', 'S'):
+        suit = upper[1]
+        rest = upper[2:]
     else:
-        multiplier = 1
+        assert False, "Invalid contract format: {}".format(contract)
+    dbl = 'XX' if rest.startswith('XX') else 'X' if rest.startswith('X') else ''
+    return level, suit, dbl
+
+def _contract_score(level: int, suit: str, dbl: str, vulnerable: bool, tricks: int) -> int:
+    """Score a parsed contract; see calculate_bridge_score."""
+    multiplier = DOUBLE_MULTIPLIERS[dbl]
     
     # Parse tricks made (overtricks or undertricks)
     assert tricks >= level or tricks <= -1, \
-            "Invalid tricks for contract {}: {}".format(contract, tricks)
+            "Invalid tricks for contract {}{}{}: {}".format(level, suit, dbl, tricks)
         
     # Contract made (tricks_taken is total tricks)
     if tricks >= level:
         # Base score
         base_score = 0
-        if suit in ['C', 'D']:  # Minor suits
+        if suit in MINOR_SUITS:
             base_score = level * 20
-        elif suit in ['H', 'S']:  # Major suits
+        elif suit in MAJOR_SUITS:
             base_score = level * 30
         elif suit == 'NT':  # No Trump
             base_score = level * 30 + 10
@@ -84,9 +107,9 @@ def calculate_bridge_score(contract: str, vulnerable: bool, tricks: int) -> int:
             overtrick_value = 200 if vulnerable else 100
         elif multiplier == 4:
             overtrick_value = 400 if vulnerable else 200
-        elif suit in ['C', 'D']:
+        elif suit in MINOR_SUITS:
             overtrick_value = 20
-        elif suit in ['H', 'S', 'NT']:
+        else:  # Majors and no trump
             overtrick_value = 30
         
         # Calculate overtricks
@@ -125,6 +148,63 @@ def calculate_bridge_score(contract: str, vulnerable: bool, tricks: int) -> int:
 
         return -penalty
     
+# Every legal result scored once at import: (level, suit, dbl, vulnerable, tricks) -> score,
+# for tricks from the level up to 7 and undertricks down to -13
+_SCORE_TABLE = {
+    (level, suit, dbl, vulnerable, tricks): _contract_score(level, suit, dbl, vulnerable, tricks)
+    for level in range(1, 8)
+    for suit in ('C', 'D', 'H', 'S', 'NT')
+    for dbl in ('', 'X', 'XX')
+    for vulnerable in (False, True)
+    for tricks in (*range(level, 8), *range(-13, 0))
+}
+
+# Every result calculate_bridge_score accepts as a dense array indexed by
+# [level-1, suit, dbl, vulnerable, tricks+13], for tricks from -13 to 13;
+# slots for impossible results are left at zero
+SUIT_INDEX = {'C': 0, 'D': 1, 'H': 2, 'S': 3, 'NT': 4}
+DBL_INDEX = {'': 0, 'X': 1, 'XX': 2}
+def _build_score_array() -> np.ndarray:
+    table = np.zeros((7, 5, 3, 2, 27), dtype=np.int32)
+    for level in range(1, 8):
+        for suit, s in SUIT_INDEX.items():
+            for dbl, d in DBL_INDEX.items():
+                for vulnerable in (False, True):
+                    for tricks in (*range(level, 14), *range(-13, 0)):
+                        table[level - 1, s, d, int(vulnerable), tricks + 13] = \
+                            _contract_score(level, suit, dbl, vulnerable, tricks)
+    return table
+
+_SCORE_ARRAY = _build_score_array()
+
+def calculate_bridge_score_batch(contracts, vulnerable, tricks) -> np.ndarray:
+    """
+    Vectorized calculate_bridge_score over parallel sequences of results.
+    
+    Args:
+        contracts: Contract strings, e.g. ["4H", "3NTX"]
+        vulnerable: Declarer vulnerability for each result
+        tricks: Tricks made (>= level) or undertricks (<= -1) for each result
+    
+    Returns:
+        np.ndarray: int32 score for each result
+    """
+    parsed = [_parse_contract(contract) for contract in contracts]
+    level = np.fromiter((p[0] for p in parsed), dtype=np.intp, count=len(parsed))
+    suit = np.fromiter((SUIT_INDEX[p[1]] for p in parsed), dtype=np.intp, count=len(parsed))
+    dbl = np.fromiter((DBL_INDEX[p[2]] for p in parsed), dtype=np.intp, count=len(parsed))
+    vul = np.asarray(vulnerable, dtype=bool).astype(np.intp)
+    tricks = np.asarray(tricks, dtype=np.intp)
+    
+    valid = ((tricks >= level) & (tricks <= 13)) | ((tricks >= -13) & (tricks <= -1))
+    assert valid.all(), "Invalid tricks for contract: {}".format(contracts[int(np.argmin(valid))])
+    return _SCORE_ARRAY[level - 1, suit, dbl, vul, tricks + 13]
+
+# Lower bound of each IMP band from 1 to 24
+IMP_THRESHOLDS = (20, 50, 90, 130, 170, 220, 270, 320, 370, 430, 500, 600,
+                  750, 900, 1100, 1300, 1500, 1750, 2000, 2250, 2500, 3000, 3500, 4000)
+IMP_BINS = np.array(IMP_THRESHOLDS)
+
 def calculate_imp(a: int, b: int) -> int:
     """
     Calculate the IMPs (International Match Points) between two scores.
@@ -136,93 +216,86 @@ def calculate_imp(a: int, b: int) -> int:
     Returns:
         int: The IMPs difference
     """
-    diff = abs(a - b)
-    imp = 0
-    
-    if diff < 20:
-        imp = 0
-    elif 20 <= diff <= 40:
-        imp = 1
-    elif 50 <= diff <= 80:
-        imp = 2
-    elif 90 <= diff <= 120:
-        imp = 3
-    elif 130 <= diff <= 160:
-        imp = 4
-    elif 170 <= diff <= 210:
-        imp = 5
-    elif 220 <= diff <= 260:
-        imp = 6
-    elif 270 <= diff <= 310:
-        imp = 7
-    elif 320 <= diff <= 360:
-        imp = 8
-    elif 370 <= diff <= 420:
-        imp = 9
-    elif 430 <= diff <= 490:
-        imp = 10
-    elif 500 <= diff <= 590:
-        imp = 11
-    elif 600 <= diff <= 740:
-        imp = 12
-    elif 750 <= diff <= 890:
-        imp = 13
-    elif 900 <= diff <= 1090:
-        imp = 14
-    elif 1100 <= diff <= 1290:
-        imp = 15
-    elif 1300 <= diff <= 1490:
-        imp = 16
-    elif 1500 <= diff <= 1740:
-        imp = 17
-    elif 1750 <= diff <= 1990:
-        imp = 18
-    elif 2000 <= diff <= 2240:
-        imp = 19
-    elif 2250 <= diff <= 2490:
-        imp = 20
-    elif 2500 <= diff <= 2990:
-        imp = 21
-    elif 3000 <= diff <= 3490:
-        imp = 22
-    elif 3500 <= diff <= 3990:
-        imp = 23
-    else:  # 4000+
-        imp = 24
-    
-    return int(imp * np.sign(a - b))
+    # The number of band lower bounds at or below the difference is the IMP count
+    diff = a - b
+    if diff < 0:
+        return -bisect_right(IMP_THRESHOLDS, -diff)
+    return bisect_right(IMP_THRESHOLDS, diff)
+
+def calculate_imp_array(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_imp over arrays of board scores.
+    
+    Args:
+        a (np.ndarray): Scores of team A, one per board
+        b (np.ndarray): Scores of team B for the same boards
+    
+    Returns:
+        np.ndarray: The IMPs for each board, signed in favour of team A
+    """
+    diff = np.asarray(a) - np.asarray(b)
+    return np.sign(diff) * np.digitize(np.abs(diff), IMP_BINS)
+
+VP_TAU = (1 + math.sqrt(5)) / 2 - 1 # Golden ratio minus 1
+VP_TAU_CUBED = VP_TAU ** 3
+
+@lru_cache(maxsize=32)
+def _vp_scale(num_boards: int) -> float:
+    return 15 * math.sqrt(num_boards)
 
 def calculate_vp(a: int, b: int, num_boards: int) -> tuple[float, float]:
-    trophy = abs(a - b)
-    tau = (1 + math.sqrt(5)) / 2 - 1 # Golden ratio minus 1
-    trophy = 3 * trophy / (15 * math.sqrt(num_boards))
-    trophy = min(10, 10 * ( tau ** trophy / tau ** 3))
+    trophy = 3 * abs(a - b) / _vp_scale(num_boards)
+    trophy = min(10, 10 * (VP_TAU ** trophy / VP_TAU_CUBED))
     if a > b:
         return 10 + trophy, 10 - trophy
     else:
         return 10 - trophy, 10 + trophy
+
+def calculate_vp_array(a: np.ndarray, b: np.ndarray, num_boards: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized calculate_vp over arrays of match IMP totals.
+    
+    Args:
+        a (np.ndarray): IMPs of team A, one per match
+        b (np.ndarray): IMPs of team B for the same matches
+        num_boards (int): Boards played in each match
+    
+    Returns:
+        tuple[np.ndarray, np.ndarray]: VPs of team A and of team B
+    """
+    a = np.asarray(a)
+    b = np.asarray(b)
+    trophy = 3 * np.abs(a - b) / _vp_scale(num_boards)
+    trophy = np.minimum(10, 10 * (VP_TAU ** trophy / VP_TAU_CUBED))
+    trophy = np.where(a > b, trophy, -trophy)
+    return 10 + trophy, 10 - trophy
     
+# Vulnerability of boards 1-16; the cycle repeats every 16 boards
+VUL_BY_BOARD = (Vul.NONE, Vul.NS, Vul.EW, Vul.ALL,
+                Vul.NS, Vul.EW, Vul.ALL, Vul.NONE,
+                Vul.EW, Vul.ALL, Vul.NONE, Vul.NS,
+                Vul.ALL, Vul.NONE, Vul.NS, Vul.EW)
+
 def calculate_vulnerability(board_number: int) -> Vul:
-    board = ((board_number - 1) % 16) + 1
-    
-    vulnerability_map = {
-        1: Vul.NONE,
-        2: Vul.NS,
-        3: Vul.EW,
-        4: Vul.ALL,
-        5: Vul.NS,
-        6: Vul.EW,
-        7: Vul.ALL,
-        8: Vul.NONE,
-        9: Vul.EW,
-        10: Vul.ALL,
-        11: Vul.NONE,
-        12: Vul.NS,
-        13: Vul.ALL,
-        14: Vul.NONE,
-        15: Vul.NS,
-        16: Vul.EW
-    }
-    
-    
-    return vulnerability_map[board]
\ No newline at end of file
+    return VUL_BY_BOARD[(board_number - 1) & 15]
+
+# Vul.value of boards 1-16, for callers that only need to compare codes
+VUL_CODE_BY_BOARD = tuple(vul.value for vul in VUL_BY_BOARD)
+
+def calculate_vulnerability_code(board_number: int) -> int:
+    """calculate_vulnerability as a plain int code (NONE=0, NS=1, EW=2, ALL=3)."""
+    return VUL_CODE_BY_BOARD[(board_number - 1) & 15]
+
+VUL_CODES = np.array(VUL_CODE_BY_BOARD, dtype=np.int8)
+
+def calculate_vulnerability_array(board_numbers: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_vulnerability over an array of board numbers.
+    
+    Args:
+        board_numbers (np.ndarray): Integer board numbers
+    
+    Returns:
+        np.ndarray: Vul values (NONE=0, NS=1, EW=2, ALL=3), one int8 per board
+    """
+    return VUL_CODES[(np.asarray(board_numbers) - 1) & 15]
\ No newline at end of file
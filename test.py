@@ -1,312 +1,501 @@
 import pytest
 from scoring import calculate_bridge_score
 
+try:
+    import pytest_benchmark
+except ImportError:
+    pytest_benchmark = None
+
+# Set to print the Swiss simulation's round-by-round report
+VERBOSE = False
+
 
 # ==============================================================================
 # TESTS FOR calculate_bridge_score
 # ==============================================================================
 
-def test_basic_partscores():
-    """Test basic partscore contracts without overtricks"""
-    # 2C making exactly (level 2) - non-vulnerable
-    assert calculate_bridge_score("2C n 2") == 90  # 40 + 50
-    # 2D making exactly (level 2) - vulnerable
-    assert calculate_bridge_score("2D v 2") == 90  # 40 + 50
-    # 2H making exactly (level 2) - non-vulnerable
-    assert calculate_bridge_score("2H n 2") == 110  # 60 + 50
-    # 2S making exactly (level 2) - vulnerable
-    assert calculate_bridge_score("2S v 2") == 110  # 60 + 50
-    # 1NT making exactly (level 1) - non-vulnerable
-    assert calculate_bridge_score("1NT n 1") == 90  # 40 + 50
-
-def test_game_contracts():
-    """Test game contracts making exactly"""
-    # 3NT making exactly (level 3) - non-vulnerable
-    assert calculate_bridge_score("3NT n 3") == 400  # 100 + 300
-    # 3NT making exactly (level 3) - vulnerable
-    assert calculate_bridge_score("3NT v 3") == 600  # 100 + 500
-    # 4H making exactly (level 4) - non-vulnerable
-    assert calculate_bridge_score("4H n 4") == 420  # 120 + 300
-    # 4S making exactly (level 4) - vulnerable
-    assert calculate_bridge_score("4S v 4") == 620  # 120 + 500
-    # 5C making exactly (level 5) - non-vulnerable
-    assert calculate_bridge_score("5C n 5") == 400  # 100 + 300
-    # 5D making exactly (level 5) - vulnerable
-    assert calculate_bridge_score("5D v 5") == 600  # 100 + 500
-
-def test_contracts_with_overtricks():
-    """Test contracts with overtricks"""
-    # 3NT making 1 overtrick (level 4 reached) - non-vulnerable
-    assert calculate_bridge_score("3NT n 4") == 430  # 100 + 300 + 30
-    # 4H making 2 overtricks (level 6 reached) - vulnerable
-    assert calculate_bridge_score("4H v 6") == 680  # 120 + 500 + 60
-    # 1NT making 3 overtricks (level 4 reached) - non-vulnerable
-    assert calculate_bridge_score("1NT n 4") == 180  # 40 + 50 + 90
-    # 2C making 5 overtricks (level 7 reached) - vulnerable
-    assert calculate_bridge_score("2C v 7") == 190  # 40 + 50 + 100
-
-def test_small_slams():
-    """Test small slam contracts (6-level)"""
-    # 6NT making exactly (level 6) - non-vulnerable
-    assert calculate_bridge_score("6NT n 6") == 990  # 190 + 300 + 500
-    # 6NT making exactly (level 6) - vulnerable
-    assert calculate_bridge_score("6NT v 6") == 1440  # 190 + 500 + 750
-    # 6H making 1 overtrick (level 7) - non-vulnerable
-    assert calculate_bridge_score("6H n 7") == 1010  # 180 + 300 + 500 + 30
-    # 6D making 1 overtrick (level 7) - vulnerable
-    assert calculate_bridge_score("6D v 7") == 1390  # 120 + 500 + 750 + 20
-
-def test_grand_slams():
-    """Test grand slam contracts (7-level)"""
-    # 7NT making exactly (level 7) - non-vulnerable
-    assert calculate_bridge_score("7NT n 7") == 1520  # 220 + 300 + 1000
-    # 7NT making exactly (level 7) - vulnerable
-    assert calculate_bridge_score("7NT v 7") == 2220  # 220 + 500 + 1500
-    # 7S making exactly (level 7) - non-vulnerable
-    assert calculate_bridge_score("7S n 7") == 1510  # 210 + 300 + 1000
-    # 7C making exactly (level 7) - vulnerable
-    assert calculate_bridge_score("7C v 7") == 2140  # 140 + 500 + 1500
-
-def test_contracts_down():
-    """Test contracts that fail (undertricks)"""
-    # 3NT down 1 - non-vulnerable
-    assert calculate_bridge_score("3NT n -1") == -50
-    # 4H down 1 - vulnerable
-    assert calculate_bridge_score("4H v -1") == -100
-    # 6NT down 2 - non-vulnerable
-    assert calculate_bridge_score("6NT n -2") == -100
-    # 7S down 3 - vulnerable
-    assert calculate_bridge_score("7S v -3") == -300
-    # 5D down 5 - vulnerable
-    assert calculate_bridge_score("5D v -5") == -500
-
-def test_doubled_contracts_made():
-    """Test doubled contracts that make"""
-    # 3NTX making exactly (level 3) - non-vulnerable
-    assert calculate_bridge_score("3NTX n 3") == 550  # 200 + 300 + 50
-    # 4HX making exactly (level 4) - vulnerable
-    assert calculate_bridge_score("4HX v 4") == 790  # 240 + 500 + 50
-    # 2CX making 1 overtrick (level 3) - non-vulnerable
-    assert calculate_bridge_score("2CX n 3") == 280  # 80 + 50 + 50 + 100 (1 overtrick)
-    # 3NTX making 2 overtricks (level 5) - vulnerable
-    assert calculate_bridge_score("3NTX v 5") == 1150  # 200 + 300 + 50 + 400 (2 overtricks)
-
-def test_redoubled_contracts_made():
-    """Test redoubled contracts that make"""
-    # 3NTXX making exactly (level 3) - non-vulnerable
-    assert calculate_bridge_score("3NTXX n 3") == 800  # 400 + 300 + 100
-    # 4HXX making exactly (level 4) - vulnerable
-    assert calculate_bridge_score("4HXX v 4") == 1080  # 480 + 500 + 100
-    # 2CXX making 1 overtrick (level 3) - non-vulnerable
-    assert calculate_bridge_score("2CXX n 3") == 760  # 160 + 300 + 100 + 200 (1 overtrick)
-    # 3NTXX making 2 overtricks (level 5) - vulnerable
-    assert calculate_bridge_score("3NTXX v 5") == 1800
-
-def test_doubled_contracts_down():
-    """Test doubled contracts that fail"""
-    # 3NTX down 1 - non-vulnerable
-    assert calculate_bridge_score("3NTX n -1") == -100
-    # 4HX down 1 - vulnerable
-    assert calculate_bridge_score("4HX v -1") == -200
-    # 6NTX down 2 - non-vulnerable
-    assert calculate_bridge_score("6NTX n -2") == -300
-    # 7SX down 2 - vulnerable
-    assert calculate_bridge_score("7SX v -2") == -500
-    # 5DX down 3 - non-vulnerable
-    assert calculate_bridge_score("5DX n -3") == -500
-    # 6CX down 3 - vulnerable
-    assert calculate_bridge_score("6CX v -3") == -800
-    # 7NTX down 4 - non-vulnerable
-    assert calculate_bridge_score("7NTX n -4") == -800  # 500 + 300
-    # 7NTX down 4 - vulnerable
-    assert calculate_bridge_score("7NTX v -4") == -1100  # 800 + 300
-
-def test_redoubled_contracts_down():
-    """Test redoubled contracts that fail"""
-    # 3NTXX down 1 - non-vulnerable
-    assert calculate_bridge_score("3NTXX n -1") == -200
-    # 4HXX down 1 - vulnerable
-    assert calculate_bridge_score("4HXX v -1") == -400
-    # 6NTXX down 2 - non-vulnerable
-    assert calculate_bridge_score("6NTXX n -2") == -600
-    # 7SXX down 2 - vulnerable
-    assert calculate_bridge_score("7SXX v -2") == -1000
-    # 5DXX down 3 - non-vulnerable
-    assert calculate_bridge_score("5DXX n -3") == -1000
-    # 6CXX down 3 - vulnerable
-    assert calculate_bridge_score("6CXX v -3") == -1600
-
-def test_doubled_slams():
-    """Test doubled and redoubled slams"""
-    # 6NTX making exactly (level 6) - non-vulnerable
-    assert calculate_bridge_score("6NTX n 6") == 1230
-    # 6HX making exactly (level 6) - vulnerable
-    assert calculate_bridge_score("6HX v 6") == 1660
-    # 7NTXX making exactly (level 7) - vulnerable
-    assert calculate_bridge_score("7NTXX v 7") == 2980  # 880 + 500 + 1500 + 100
+@pytest.mark.parametrize("contract,vulnerable,tricks,expected", [
+    # Basic partscore contracts without overtricks
+    ("2C", False, 2, 90),  # 40 + 50
+    ("2D", True, 2, 90),  # 40 + 50
+    ("2H", False, 2, 110),  # 60 + 50
+    ("2S", True, 2, 110),  # 60 + 50
+    ("1NT", False, 1, 90),  # 40 + 50
+    # Game contracts making exactly
+    ("3NT", False, 3, 400),  # 100 + 300
+    ("3NT", True, 3, 600),  # 100 + 500
+    ("4H", False, 4, 420),  # 120 + 300
+    ("4S", True, 4, 620),  # 120 + 500
+    ("5C", False, 5, 400),  # 100 + 300
+    ("5D", True, 5, 600),  # 100 + 500
+    # Contracts with overtricks
+    ("3NT", False, 4, 430),  # 100 + 300 + 30
+    ("4H", True, 6, 680),  # 120 + 500 + 60
+    ("1NT", False, 4, 180),  # 40 + 50 + 90
+    ("2C", True, 7, 190),  # 40 + 50 + 100
+    # Small slam contracts (6-level)
+    ("6NT", False, 6, 990),  # 190 + 300 + 500
+    ("6NT", True, 6, 1440),  # 190 + 500 + 750
+    ("6H", False, 7, 1010),  # 180 + 300 + 500 + 30
+    ("6D", True, 7, 1390),  # 120 + 500 + 750 + 20
+    # Grand slam contracts (7-level)
+    ("7NT", False, 7, 1520),  # 220 + 300 + 1000
+    ("7NT", True, 7, 2220),  # 220 + 500 + 1500
+    ("7S", False, 7, 1510),  # 210 + 300 + 1000
+    ("7C", True, 7, 2140),  # 140 + 500 + 1500
+    # Contracts that fail (undertricks)
+    ("3NT", False, -1, -50),
+    ("4H", True, -1, -100),
+    ("6NT", False, -2, -100),
+    ("7S", True, -3, -300),
+    ("5D", True, -5, -500),
+    # Doubled contracts that make
+    ("3NTX", False, 3, 550),  # 200 + 300 + 50
+    ("4HX", True, 4, 790),  # 240 + 500 + 50
+    ("2CX", False, 3, 280),  # 80 + 50 + 50 + 100 (1 overtrick)
+    ("3NTX", True, 5, 1150),  # 200 + 300 + 50 + 400 (2 overtricks)
+    # Redoubled contracts that make
+    ("3NTXX", False, 3, 800),  # 400 + 300 + 100
+    ("4HXX", True, 4, 1080),  # 480 + 500 + 100
+    ("2CXX", False, 3, 760),  # 160 + 300 + 100 + 200 (1 overtrick)
+    ("3NTXX", True, 5, 1800),
+    # Doubled contracts that fail
+    ("3NTX", False, -1, -100),
+    ("4HX", True, -1, -200),
+    ("6NTX", False, -2, -300),
+    ("7SX", True, -2, -500),
+    ("5DX", False, -3, -500),
+    ("6CX", True, -3, -800),
+    ("7NTX", False, -4, -800),  # 500 + 300
+    ("7NTX", True, -4, -1100),  # 800 + 300
+    # Redoubled contracts that fail
+    ("3NTXX", False, -1, -200),
+    ("4HXX", True, -1, -400),
+    ("6NTXX", False, -2, -600),
+    ("7SXX", True, -2, -1000),
+    ("5DXX", False, -3, -1000),
+    ("6CXX", True, -3, -1600),
+    # Doubled and redoubled slams
+    ("6NTX", False, 6, 1230),
+    ("6HX", True, 6, 1660),
+    ("7NTXX", True, 7, 2980),  # 880 + 500 + 1500 + 100
+])
+def test_calculate_bridge_score(contract, vulnerable, tricks, expected):
+    """Contract results score as expected"""
+    assert calculate_bridge_score(contract, vulnerable, tricks) == expected
 
 def test_invalid_inputs():
     """Test that invalid inputs raise assertions"""
-    # Invalid number of parts
+    # Missing or non-integer trick count
+    with pytest.raises(AssertionError):
+        calculate_bridge_score("4H", False, None)
+    
     with pytest.raises(AssertionError):
-        calculate_bridge_score("4H n")
+        calculate_bridge_score("4H", False, "4")
     
+    # Still rejected once the equal int result has been scored and cached
+    calculate_bridge_score("4H", False, 4)
     with pytest.raises(AssertionError):
-        calculate_bridge_score("4H n 0 extra")
+        calculate_bridge_score("4H", False, 4.0)
     
     # Invalid contract format
     with pytest.raises(AssertionError):
-        calculate_bridge_score("8H n 0")  # Level 8 doesn't exist but will parse
+        calculate_bridge_score("8H", False, 8)  # Level 8 doesn't exist
     
     with pytest.raises(AssertionError):
-        calculate_bridge_score("H4 n 0")  # Wrong order
+        calculate_bridge_score("H4", False, 4)  # Wrong order
     
     with pytest.raises(AssertionError):
-        calculate_bridge_score("4Z n 0")  # Invalid suit
+        calculate_bridge_score("4Z", False, 4)  # Invalid suit
     
-    # Note: We don't validate trick counts in the new version
-    # since we calculate overtricks from total tricks
+    # Made contracts must reach their level
+    with pytest.raises(AssertionError):
+        calculate_bridge_score("4H", False, 2)
 
 def test_edge_cases():
     """Test edge cases and boundary conditions"""
     # Maximum overtricks - 1C making level 7 (6 overtricks)
-    assert calculate_bridge_score("1C n 7") > 0
+    assert calculate_bridge_score("1C", False, 7) > 0
     
     # Maximum undertricks
-    assert calculate_bridge_score("7NT v -13") < 0  # Down 13 tricks
+    assert calculate_bridge_score("7NT", True, -13) < 0  # Down 13 tricks
     
     # All suits work
     for suit in ['C', 'D', 'H', 'S']:
-        assert calculate_bridge_score(f"3{suit} n 3") > 0
+        assert calculate_bridge_score(f"3{suit}", False, 3) > 0
     
     # NT works
-    assert calculate_bridge_score("3NT n 3") == 400
+    assert calculate_bridge_score("3NT", False, 3) == 400
     
     # Lowercase suit should work (gets converted to uppercase)
-    assert calculate_bridge_score("3nt n 3") == 400
-    assert calculate_bridge_score("4h n 4") == 420
+    assert calculate_bridge_score("3nt", False, 3) == 400
+    assert calculate_bridge_score("4h", False, 4) == 420
 
 
-def test_swiss_pairing_17_teams_8_rounds():
+def _run_swiss(num_teams, num_rounds, seed, log=None):
     """
-    Test Swiss pairing system with 17 teams over 8 rounds.
-    Simulates a complete tournament with random VP results.
-    Uses a 20 VP system (total VPs in a match sum to 20).
+    Simulate a Swiss tournament with random VP results on a 20 VP scale.
+    
+    An odd field gets an extra bye team. Round-by-round report lines are appended
+    to log when it is given.
+    
+    Returns:
+        (bye_team, standings in half VPs, previous_opponents)
     """
     from movements import swiss_pairing
-    import random
+    from heapq import nlargest
+    from operator import itemgetter
+    import numpy as np
     
-    random.seed(42)  # For reproducibility
-    
-    # 17 teams means we need an 18th team as bye
-    num_teams = 17
-    num_rounds = 8
-    bye_team = num_teams + 1  # Team 18 is the bye
+    # An odd field needs an extra team as bye
+    bye_team = num_teams + 1 if num_teams % 2 else None
     
     # All teams including bye
-    all_teams = list(range(1, num_teams + 1)) + [bye_team]
+    all_teams = list(range(1, num_teams + 1)) + ([bye_team] if bye_team else [])
+    
+    # Initialize standings (all teams start with 0 VP); VPs come in steps of 0.5,
+    # so standings are kept as integer counts of half VPs
+    standings = {team: 0 for team in all_teams}
     
-    # Initialize standings (all teams start with 0 VP)
-    standings = {team: 0.0 for team in all_teams}
+    # Draw every match's VPs up front: triangular around 10, in half VPs
+    rng = np.random.default_rng(seed)
+    half_vp_draws = np.rint(rng.triangular(0, 10, 20, size=(num_rounds, len(all_teams) // 2)) * 2).astype(int)
     
     # Initialize previous opponents
-    previous_opponents = {team: [] for team in all_teams}
+    previous_opponents = {team: set() for team in all_teams}
     
-    print("\n" + "="*80)
-    print(f"SWISS SYSTEM TOURNAMENT - {num_teams} TEAMS - {num_rounds} ROUNDS")
-    print("="*80)
+    # Teams that played a match this round, indexed by team number
+    played_mask = bytearray(num_teams + 2)
+    
+    standings_row = "  {:2d}. Team {:2d}: {:6.1f} VP ({} matches)".format
+    report_top = 8
+    if log is not None:
+        log.append("\n" + "="*80)
+        log.append(f"SWISS SYSTEM TOURNAMENT - {num_teams} TEAMS - {num_rounds} ROUNDS")
+        log.append("="*80)
     
     for round_num in range(1, num_rounds + 1):
-        print(f"\n{'='*80}")
-        print(f"ROUND {round_num}")
-        print(f"{'='*80}")
-        
         # Generate pairings for this round
-        pairings = swiss_pairing(all_teams, standings, previous_opponents, round_num, bye_team)
-        
-        # Extract unique matches (skip duplicate open/closed entries)
-        matches = []
-        seen_matches = set()
-        for table, room, team_ns, team_ew in pairings:
-            match_key = tuple(sorted([team_ns, team_ew]))
-            if room == 'open' and match_key not in seen_matches:
-                matches.append((table, team_ns, team_ew))
-                seen_matches.add(match_key)
+        pairings = swiss_pairing(all_teams, standings, previous_opponents, round_num, bye_team,
+                                 room_filter='open')
+        matches = [(table, team_ns, team_ew) for table, room, team_ns, team_ew in pairings]
+        played_mask[:] = bytes(len(played_mask))
         
-        print(f"\nPairings (showing {len(matches)} matches):")
-        for table, team1, team2 in matches:
-            print(f"  Table {table}: Team {team1:2d} ({standings[team1]:5.1f} VP) vs Team {team2:2d} ({standings[team2]:5.1f} VP)")
+        if log is not None:
+            log.append(f"\n{'='*80}")
+            log.append(f"ROUND {round_num}")
+            log.append(f"{'='*80}")
+            log.append(f"\nPairings (showing {len(matches)} matches):")
+            for table, team1, team2 in matches:
+                log.append(f"  Table {table}: Team {team1:2d} ({standings[team1] / 2:5.1f} VP) vs Team {team2:2d} ({standings[team2] / 2:5.1f} VP)")
+            log.append(f"\nResults:")
         
         # Simulate results - generate random VPs that sum to 20
-        print(f"\nResults:")
-        for table, team1, team2 in matches:
-            # Generate random VP between 0 and 20 for team1
-            # Common distribution: more likely around 10, rare extremes
-            vp1 = random.triangular(0, 20, 10)  # Triangular distribution centered at 10
-            vp1 = round(vp1 * 2) / 2  # Round to nearest 0.5
-            vp2 = 20 - vp1
+        for match_idx, (table, team1, team2) in enumerate(matches):
+            vp1 = int(half_vp_draws[round_num - 1, match_idx])
+            vp2 = 40 - vp1
             
             standings[team1] += vp1
             standings[team2] += vp2
+            played_mask[team1] = played_mask[team2] = 1
             
             # Update opponent history
-            previous_opponents[team1].append(team2)
-            previous_opponents[team2].append(team1)
+            previous_opponents[team1].add(team2)
+            previous_opponents[team2].add(team1)
             
-            winner = team1 if vp1 > vp2 else (team2 if vp2 > vp1 else "Tie")
-            print(f"  Table {table}: Team {team1:2d} gets {vp1:4.1f} VP, Team {team2:2d} gets {vp2:4.1f} VP {f'(Team {winner} wins)' if winner != 'Tie' else '(Tie)'}")
+            if log is not None:
+                winner = team1 if vp1 > vp2 else (team2 if vp2 > vp1 else "Tie")
+                log.append(f"  Table {table}: Team {team1:2d} gets {vp1 / 2:4.1f} VP, Team {team2:2d} gets {vp2 / 2:4.1f} VP {f'(Team {winner} wins)' if winner != 'Tie' else '(Tie)'}")
         
         # Handle bye - team with bye gets 10 VP
-        playing_teams = set()
-        for table, team1, team2 in matches:
-            playing_teams.add(team1)
-            playing_teams.add(team2)
-        
-        bye_teams = set(range(1, num_teams + 1)) - playing_teams
+        bye_teams = [team for team in range(1, num_teams + 1) if not played_mask[team]]
         if bye_teams:
             for bye_team_id in bye_teams:
-                standings[bye_team_id] += 10.0
-                previous_opponents[bye_team_id].append(bye_team)
-                previous_opponents[bye_team].append(bye_team_id)
-                print(f"\n  Team {bye_team_id} has BYE - receives 10.0 VP")
+                standings[bye_team_id] += 20
+                previous_opponents[bye_team_id].add(bye_team)
+                previous_opponents[bye_team].add(bye_team_id)
+                if log is not None:
+                    log.append(f"\n  Team {bye_team_id} has BYE - receives 10.0 VP")
         
-        # Print standings after this round
-        print(f"\nStandings after Round {round_num}:")
-        sorted_standings = sorted(standings.items(), key=lambda x: x[1], reverse=True)
-        for rank, (team, vp) in enumerate(sorted_standings, 1):
-            if team == bye_team:
-                continue
-            matches_played = len(previous_opponents[team])
-            print(f"  {rank:2d}. Team {team:2d}: {vp:6.1f} VP ({matches_played} matches)")
+        # Print the leading teams after this round
+        if log is not None:
+            log.append(f"\nTop {report_top} after Round {round_num}:")
+            leaders = nlargest(report_top, ((t, v) for t, v in standings.items() if t != bye_team),
+                               key=itemgetter(1))
+            for rank, (team, vp) in enumerate(leaders, 1):
+                matches_played = len(previous_opponents[team])
+                log.append(standings_row(rank, team, vp / 2, matches_played))
     
     # Final tournament summary
-    print(f"\n{'='*80}")
-    print("FINAL STANDINGS")
-    print(f"{'='*80}")
-    sorted_standings = sorted(
-        [(t, v) for t, v in standings.items() if t != bye_team], 
-        key=lambda x: x[1], 
-        reverse=True
-    )
-    for rank, (team, vp) in enumerate(sorted_standings, 1):
-        matches_played = len(previous_opponents[team])
-        opponents = ", ".join(str(o) for o in previous_opponents[team] if o != bye_team)
-        print(f"  {rank:2d}. Team {team:2d}: {vp:6.1f} VP ({matches_played} matches)")
-        print(f"      Played against: {opponents}")
-    
-    # Verify all teams played correct number of rounds
+    if log is not None:
+        log.append(f"\n{'='*80}")
+        log.append("FINAL STANDINGS")
+        log.append(f"{'='*80}")
+        final_standings = sorted(((t, v) for t, v in standings.items() if t != bye_team),
+                                 key=itemgetter(1), reverse=True)
+        for rank, (team, vp) in enumerate(final_standings, 1):
+            matches_played = len(previous_opponents[team])
+            opponents = ", ".join(str(o) for o in previous_opponents[team] if o != bye_team)
+            log.append(standings_row(rank, team, vp / 2, matches_played))
+            log.append(f"      Played against: {opponents}")
+    
+    return bye_team, standings, previous_opponents
+
+
+def test_swiss_pairing_17_teams_8_rounds():
+    """
+    Test Swiss pairing system with 17 teams over 8 rounds.
+    Simulates a complete tournament with random VP results.
+    Uses a 20 VP system (total VPs in a match sum to 20).
+    """
+    num_teams = 17
+    num_rounds = 8
+    
+    # The round-by-round report is only built when VERBOSE is set, and printed once at the end
+    log = [] if VERBOSE else None
+    bye_team, standings, previous_opponents = _run_swiss(num_teams, num_rounds, 42, log)
+    
+    # Verify every team met a different opponent (or the bye once) in each round;
+    # a rematch would leave fewer distinct opponents than rounds
     for team in range(1, num_teams + 1):
         assert len(previous_opponents[team]) == num_rounds, \
-            f"Team {team} played {len(previous_opponents[team])} matches, expected {num_rounds}"
+            f"Team {team} had {len(previous_opponents[team])} distinct opponents, expected {num_rounds}"
     
-    # Verify no team played the same opponent twice (except bye)
-    for team in range(1, num_teams + 1):
-        opponents = [o for o in previous_opponents[team] if o != bye_team]
-        assert len(opponents) == len(set(opponents)), \
-            f"Team {team} played against the same opponent twice!"
-    
-    print(f"\n{'='*80}")
-    print("✓ Tournament completed successfully!")
-    print(f"✓ All {num_teams} teams played {num_rounds} rounds")
-    print("✓ No rematches occurred")
-    print(f"{'='*80}\n")
+    if VERBOSE:
+        log.append(f"\n{'='*80}")
+        log.append("✓ Tournament completed successfully!")
+        log.append(f"✓ All {num_teams} teams played {num_rounds} rounds")
+        log.append("✓ No rematches occurred")
+        log.append(f"{'='*80}\n")
+        print("\n".join(log))
+
+
+@pytest.mark.skipif(pytest_benchmark is None, reason="pytest-benchmark is not installed")
+def test_swiss_perf(benchmark):
+    """Time a 100-team, 9-round Swiss simulation."""
+    benchmark(_run_swiss, 100, 9, 42)
+
+
+@pytest.mark.parametrize("pairer", ["swiss_pairing", "swiss_pairing_fast"])
+def test_swiss_pairing_large_field_uses_greedy(pairer, monkeypatch):
+    """Fields above SWISS_FAST_THRESHOLD are paired greedily without rematches."""
+    import movements
+    from movements import SWISS_FAST_THRESHOLD
+    import random
+    
+    greedy_calls = []
+    greedy = movements._greedy_swiss_pairing
+    def record_greedy(*args, **kwargs):
+        greedy_calls.append(args)
+        return greedy(*args, **kwargs)
+    def no_solver(cost):
+        raise AssertionError("matching solver used for a large field")
+    monkeypatch.setattr(movements, "_greedy_swiss_pairing", record_greedy)
+    monkeypatch.setattr(movements, "_assignment_matching", no_solver)
+    monkeypatch.setattr(movements, "_milp_matching", no_solver)
+    
+    random.seed(7)
+    num_teams = SWISS_FAST_THRESHOLD + 4
+    teams = list(range(1, num_teams + 1))
+    standings = {team: float(random.randint(0, 40)) for team in teams}
+    # Everyone has already played their neighbour in the previous round
+    previous_opponents = {team: [team + 1 if team % 2 else team - 1] for team in teams}
+    
+    pairings = getattr(movements, pairer)(teams, standings, previous_opponents, 2)
+    assert len(greedy_calls) == 1
+    
+    open_matches = [(ns, ew) for table, room, ns, ew in pairings if room == 'open']
+    assert len(open_matches) == num_teams // 2
+    assert sorted(team for match in open_matches for team in match) == teams
+    for team1, team2 in open_matches:
+        assert team2 not in previous_opponents[team1]
+
+
+def test_vulnerability_array_matches_scalar():
+    """calculate_vulnerability_array agrees with calculate_vulnerability across the 16-board cycle."""
+    from scoring import calculate_vulnerability, calculate_vulnerability_array
+    import numpy as np
+    
+    boards = np.arange(1, 49)
+    assert calculate_vulnerability_array(boards).tolist() == \
+        [calculate_vulnerability(int(board)).value for board in boards]
+
+
+def test_bridge_score_batch_matches_scalar():
+    """calculate_bridge_score_batch agrees with calculate_bridge_score."""
+    from scoring import calculate_bridge_score_batch
+    
+    results = [("4H", False, 4), ("3NTX", True, -2), ("7NTXX", True, 7), ("1C", False, 5), ("6S", True, -13),
+               ("3NT", False, 10), ("1CXX", True, 13), ("6DX", False, 8)]
+    contracts, vulnerable, tricks = zip(*results)
+    assert calculate_bridge_score_batch(contracts, vulnerable, tricks).tolist() == \
+        [calculate_bridge_score(*result) for result in results]
+    
+    # Results the scalar function rejects are rejected for the whole batch
+    with pytest.raises(AssertionError):
+        calculate_bridge_score_batch(["4H", "4H"], [False, False], [4, 14])
+    with pytest.raises(AssertionError):
+        calculate_bridge_score_batch(["4H", "4H"], [False, False], [4, 2])
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    """A TestClient serving from a scratch directory that holds one 6-team Swiss tournament."""
+    import os
+    import sys
+    from fastapi.testclient import TestClient
+    
+    workdir = tmp_path_factory.mktemp("api")
+    os.symlink(os.path.join(os.path.dirname(os.path.abspath(__file__)), "html"), workdir / "html")
+    cwd, argv = os.getcwd(), sys.argv
+    os.chdir(workdir)
+    sys.argv = ["bridge_score"]
+    try:
+        import bridge_score
+        with TestClient(bridge_score.app) as client:
+            response = client.post("/api/tournament/setup", json={
+                "tournamentName": "Test", "tournamentForm": "teams", "numEntries": 6, "boardsPerRound": 3,
+                "scoringMethod": "imp", "movementType": "swiss", "numRounds": 3})
+            yield client, response.json()["tournament_id"]
+    finally:
+        os.chdir(cwd)
+        sys.argv = argv
+
+def _table_token(client, tournament_id, table_id):
+    response = client.post("/api/table/get_token", json={"tournamentId": tournament_id, "tableId": table_id})
+    return response.json()["token"]
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+def test_session_token_round_trip(api):
+    """A token issued for a table is accepted for that table."""
+    client, tournament_id = api
+    token = _table_token(client, tournament_id, 1)
+    response = client.post("/api/scores", headers=_bearer(token), json={"name": "t", "score": 1})
+    assert response.status_code == 200, response.text
+
+def test_session_token_rejected(api):
+    """Tampered, expired and malformed tokens get a 401, never a server error."""
+    import time
+    from auth import _sign
+    
+    client, tournament_id = api
+    token = _table_token(client, tournament_id, 1)
+    tid, table, expires_at, signature = token.split(".")
+    expired = f"{tid}.{table}.{int(time.time()) - 1}"
+    
+    bad_tokens = [
+        f"{tid}.{table}.{expires_at}.{signature[:-1]}{'B' if signature[-1] == 'A' else 'A'}",
+        f"{int(tid) + 1}.{table}.{expires_at}.{signature}",
+        f"{tid}.{int(table) + 1}.{expires_at}.{signature}",
+        f"{tid}.{table}.{int(expires_at) + 1}.{signature}",
+        f"{expired}.{_sign(expired)}",
+        f"{tid}.{table}.{signature}",
+        f"{tid}.{table}.{expires_at}.{expires_at}.{signature}",
+        f"{tid}.{table}.soon.{signature}",
+        "...",
+        "nope",
+    ]
+    for bad in bad_tokens:
+        response = client.post("/api/scores", headers=_bearer(bad), json={"name": "t", "score": 1})
+        assert response.status_code == 401, (bad, response.status_code, response.text)
+    
+    response = client.post("/api/scores", headers=_bearer(f"{expired}.{_sign(expired)}"), json={})
+    assert response.json()["detail"] == "Authentication token expired"
+
+def _board_scores(client, table_id):
+    response = client.get(f"/api/table/{table_id}/round/1/results")
+    return {result["boardNumber"]: result["score"] for result in response.json()["results"]}
+
+def test_submit_score_batch(api):
+    """A batch is scored from NS's side and saved in one request."""
+    client, tournament_id = api
+    token = _table_token(client, tournament_id, 1)
+    response = client.post("/api/score/submit_batch", headers=_bearer(token), json={"scores": [
+        {"tableId": 1, "round": 1, "boardNumber": 1, "contract": "4H", "declarer": "N", "result": 4},
+        {"tableId": 1, "round": 1, "boardNumber": 2, "contract": "3NT", "declarer": "E", "result": -1}]})
+    assert response.status_code == 200, response.text
+    assert response.json()["scores"] == [{"boardNumber": 1, "score": 420}, {"boardNumber": 2, "score": 50}]
+    assert _board_scores(client, 1) == {1: 420, 2: 50}
+
+def test_submit_score_batch_invalid_contract_saves_nothing(api):
+    """One bad contract rejects the whole batch, including the entries before it."""
+    client, tournament_id = api
+    token = _table_token(client, tournament_id, 2)
+    response = client.post("/api/score/submit_batch", headers=_bearer(token), json={"scores": [
+        {"tableId": 2, "round": 1, "boardNumber": 1, "contract": "4H", "declarer": "N", "result": 4},
+        {"tableId": 2, "round": 1, "boardNumber": 2, "contract": "8H", "declarer": "N", "result": 8}]})
+    assert response.status_code == 400, response.text
+    assert _board_scores(client, 2) == {}
+
+def test_submit_score_batch_other_table(api):
+    """An entry for a table the token wasn't issued for rejects the whole batch."""
+    client, tournament_id = api
+    token = _table_token(client, tournament_id, 3)
+    response = client.post("/api/score/submit_batch", headers=_bearer(token), json={"scores": [
+        {"tableId": 3, "round": 1, "boardNumber": 1, "contract": "4H", "declarer": "N", "result": 4},
+        {"tableId": 2, "round": 1, "boardNumber": 1, "contract": "4H", "declarer": "N", "result": 4}]})
+    assert response.status_code == 403, response.text
+    assert _board_scores(client, 3) == {}
+    assert _board_scores(client, 2) == {}
+
+def test_migrate_dedupes_board_results_and_backfills(tmp_path, monkeypatch):
+    """migrate() keeps the latest of each duplicated result and fills standings and team_history."""
+    import json
+    import sqlite3
+    import database
+    from db_migrations import migrate
+    
+    monkeypatch.chdir(tmp_path)
+    database.init_master_db()
+    conn = sqlite3.connect(database.MASTER_DB_NAME)
+    conn.execute("""INSERT INTO tournaments (id, tournament_name, tournament_form, num_entries,
+                                             boards_per_round, scoring_method, movement_type)
+                    VALUES (1, 'Old', 'teams', 4, 3, 'imp', 'swiss')""")
+    conn.commit()
+    conn.close()
+    
+    # A tournament DB from before opponent_table, the unique board_results index,
+    # standings and team_history
+    conn = sqlite3.connect(database.tournament_db_name(1))
+    conn.executescript("""
+        CREATE TABLE rounds (id INTEGER PRIMARY KEY AUTOINCREMENT, round_number INTEGER NOT NULL,
+                             table_id INTEGER NOT NULL, entry1_id INTEGER NOT NULL, entry2_id INTEGER NOT NULL,
+                             boards TEXT NOT NULL, status TEXT DEFAULT 'pending');
+        CREATE INDEX idx_rounds_round_table ON rounds(round_number, table_id);
+        CREATE TABLE board_results (id INTEGER PRIMARY KEY AUTOINCREMENT, table_id INTEGER NOT NULL,
+                                    round_number INTEGER NOT NULL, board_number INTEGER NOT NULL,
+                                    contract TEXT NOT NULL, declarer TEXT NOT NULL, vulnerable INTEGER NOT NULL,
+                                    result INTEGER NOT NULL, score INTEGER NOT NULL,
+                                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE match_results (id INTEGER PRIMARY KEY AUTOINCREMENT, table_id INTEGER, round_number INTEGER,
+                                    total_score INTEGER, opponent_score INTEGER, imps INTEGER, vp REAL,
+                                    UNIQUE(table_id, round_number));
+    """)
+    conn.executemany("INSERT INTO rounds (round_number, table_id, entry1_id, entry2_id, boards) VALUES (?, ?, ?, ?, ?)",
+                     [(1, 1, 1, 2, "1-3"), (1, 2, 3, 4, "1-3"), (2, 1, 1, 3, "4-6"), (2, 2, 2, 4, "4-6")])
+    conn.executemany("""INSERT INTO board_results (table_id, round_number, board_number, contract, declarer,
+                                                   vulnerable, result, score)
+                        VALUES (1, 1, ?, ?, 'N', 0, ?, ?)""",
+                     [(1, "2H", 2, 110), (1, "3H", 3, 140), (2, "1NT", 1, 90), (1, "4H", 4, 420)])
+    conn.executemany("INSERT INTO match_results (table_id, round_number, vp) VALUES (?, ?, ?)",
+                     [(1, 1, 12.5), (2, 1, 7.5), (1, 2, 10.0), (2, 2, 10.0)])
+    conn.commit()
+    conn.close()
+    
+    migrate()
+    
+    conn = sqlite3.connect(database.tournament_db_name(1))
+    try:
+        assert conn.execute("SELECT board_number, contract, score FROM board_results ORDER BY board_number").fetchall() \
+            == [(1, "4H", 420), (2, "1NT", 90)]
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("""INSERT INTO board_results (table_id, round_number, board_number, contract, declarer,
+                                                       vulnerable, result, score)
+                            VALUES (1, 1, 1, '4S', 'N', 0, 4, 420)""")
+        assert conn.execute("SELECT table_id, total_vp FROM standings ORDER BY table_id").fetchall() \
+            == [(1, 22.5), (2, 17.5)]
+        history = {team: json.loads(opponents) for team, opponents in conn.execute("SELECT * FROM team_history")}
+        assert history == {1: [2, 3], 2: [1, 4], 3: [4, 1], 4: [3, 2]}
+    finally:
+        conn.close()